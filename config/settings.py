@@ -35,11 +35,17 @@ AI_SERVICE = os.getenv("AI_SERVICE", "huggingface")  # huggingface, cohere, loca
 AI_MODEL = os.getenv("AI_MODEL", "gpt2")  # Default model
 AI_MAX_TOKENS = int(os.getenv("AI_MAX_TOKENS", "1000"))
 AI_TEMPERATURE = float(os.getenv("AI_TEMPERATURE", "0.7"))
+AI_CACHE_MIN_TOKENS = int(os.getenv("AI_CACHE_MIN_TOKENS", "4096"))  # Smallest prompt prefix worth an explicit Gemini context cache
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "32"))  # keep-alive connections per host for the REST-backed services
 
 # Calendar Service Configuration
 CALENDAR_SERVICE = os.getenv("CALENDAR_SERVICE", "local")  # local, ics, sqlite
 DEFAULT_MEETING_DURATION = int(os.getenv("DEFAULT_MEETING_DURATION", "60"))  # minutes
 BUFFER_TIME = int(os.getenv("BUFFER_TIME", "15"))  # minutes between meetings
+SCHEDULE_CACHE_TTL = int(os.getenv("SCHEDULE_CACHE_TTL", "60"))  # seconds other users' schedules are cached
+SCHEDULE_CACHE_SIZE = int(os.getenv("SCHEDULE_CACHE_SIZE", "1024"))
+AVAILABILITY_CACHE_TTL = int(os.getenv("AVAILABILITY_CACHE_TTL", "30"))  # seconds a free/busy check for the same slot is reused
+VETTED_SLOT_TTL = int(os.getenv("VETTED_SLOT_TTL", "60"))  # seconds a just-offered meeting slot can be confirmed without a re-check
 WORKING_HOURS = {
     "start": "09:00",
     "end": "18:00"
@@ -53,10 +59,16 @@ MAX_RESTAURANT_RESULTS = int(os.getenv("MAX_RESTAURANT_RESULTS", "10"))
 # Email Service Configuration
 EMAIL_SERVICE = os.getenv("EMAIL_SERVICE", "smtp")  # smtp, local, console
 EMAIL_TONE = os.getenv("EMAIL_TONE", "professional")  # professional, casual, formal
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "10"))  # max idle SMTP connections kept open
+SMTP_MESSAGES_PER_CONNECTION = int(os.getenv("SMTP_MESSAGES_PER_CONNECTION", "100"))  # recycle after N messages
+SMTP_CONNECTION_TTL = int(os.getenv("SMTP_CONNECTION_TTL", "300"))  # seconds an idle connection may be reused
+SMTP_RECIPIENTS_PER_ENVELOPE = int(os.getenv("SMTP_RECIPIENTS_PER_ENVELOPE", "25"))  # larger recipient lists are split and sent in parallel
 
 # Restaurant Service Configuration
 RESTAURANT_SERVICE = os.getenv("RESTAURANT_SERVICE", "api")  # api, local, scraping, manual
 RESTAURANT_DB_PATH = os.getenv("RESTAURANT_DB_PATH", str(DATA_DIR / "restaurants.json"))
+RESTAURANT_CACHE_DIR = os.getenv("RESTAURANT_CACHE_DIR", str(BASE_DIR / ".cache" / "restaurants"))
+RESTAURANT_CACHE_TTL = int(os.getenv("RESTAURANT_CACHE_TTL", "21600"))  # seconds (6 hours)
 
 # API Keys for Restaurant Services
 GOOGLE_PLACES_API_KEY = os.getenv("GOOGLE_PLACES_API_KEY", "")
@@ -68,6 +80,11 @@ REQUIRE_USER_CONFIRMATION = os.getenv("REQUIRE_USER_CONFIRMATION", "True").lower
 CHECK_USER_CALENDAR = os.getenv("CHECK_USER_CALENDAR", "True").lower() == "true"
 TEAM_SIZE_LIMIT = int(os.getenv("TEAM_SIZE_LIMIT", "20"))
 MAX_MEETING_ATTENDEES = int(os.getenv("MAX_MEETING_ATTENDEES", "50"))
+ACTION_RESULT_CACHE_TTL = int(os.getenv("ACTION_RESULT_CACHE_TTL", "300"))  # seconds read-only action results are reused
+ACTION_DEDUPE_TTL = int(os.getenv("ACTION_DEDUPE_TTL", "10"))  # seconds a repeated side-effecting action is treated as a double-submit
+ASSISTANT_HISTORY_MAX = int(os.getenv("ASSISTANT_HISTORY_MAX", "200"))  # most recent queries kept per Assistant
+GOAL_PARSE_CACHE_SIZE = int(os.getenv("GOAL_PARSE_CACHE_SIZE", "512"))  # parsed queries remembered by the goal parser
+USER_PROFILES_FLUSH_DELAY = float(os.getenv("USER_PROFILES_FLUSH_DELAY", "0.2"))  # seconds profile changes wait so a burst is written once (0 writes immediately)
 
 # File paths
 USER_PROFILES_PATH = USERS_DIR / "user_profiles.json"
@@ -712,6 +712,30 @@ def test_simple():
             'message': f'Simple test failed: {str(e)}'
         }), 500
 
+@app.route('/metrics')
+def metrics():
+    """Cache hit/miss counters for the memoized service reads"""
+    try:
+        assistant = get_assistant()
+        if not assistant:
+            return jsonify({
+                'success': False,
+                'message': 'Assistant not available'
+            }), 503
+        
+        return jsonify({
+            'success': True,
+            'timestamp': datetime.now().isoformat(),
+            'calendar_schedule_cache': dict(getattr(assistant.calendar_service, 'cache_stats', {})),
+            'restaurant_search_cache': dict(getattr(assistant.restaurant_service, 'cache_stats', {}))
+        })
+    except Exception as e:
+        logger.error(f"Error getting metrics: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Error getting metrics: {str(e)}'
+        }), 500
+
 @app.route('/health')
 def health_check():
     """Health check endpoint for AWS"""
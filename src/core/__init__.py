@@ -4,7 +4,7 @@ Core modules for the Proactive Work-Life Assistant
 from .assistant import Assistant
 from .goal_parser import GoalParser
 from .task_planner import TaskPlanner
-from .action_executor import ActionExecutor
+from .action_executor import ActionExecutor, ActionType, get_action_executor
 from .user_manager import UserManager
 from .employee_filter import EmployeeFilter
 from .confirmation_handler import ConfirmationHandler
@@ -14,6 +14,8 @@ __all__ = [
     'GoalParser',
     'TaskPlanner',
     'ActionExecutor',
+    'ActionType',
+    'get_action_executor',
     'UserManager',
     'EmployeeFilter',
     'ConfirmationHandler'
@@ -1,23 +1,259 @@
 """
 Action Executor for performing final actions
 """
+import asyncio
+import atexit
+import hashlib
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from enum import IntEnum
+from functools import cached_property, wraps
 from typing import Dict, Any, List, Optional
-from src.services.calendar_service import CalendarService
-from src.services.email_service import EmailService
-from src.services.restaurant_service import RestaurantService
+from config.settings import ACTION_RESULT_CACHE_TTL, ACTION_DEDUPE_TTL
+from src.utils.logger import setup_logger
+
+try:
+    from cachetools import TTLCache
+    CACHETOOLS_AVAILABLE = True
+except ImportError:
+    CACHETOOLS_AVAILABLE = False
+
+# Optional: libuv-based event loop for run_sync (pip install uvloop)
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+logger = setup_logger("action_executor")
+
+# Sender used for invites when the user's address is unknown
+_DEFAULT_SENDER = 'assistant@company.com'
+
+# Success message templates
+_MEETING_SCHEDULED_MSG = 'Meeting scheduled successfully! Event created and invites sent to {} attendees.'
+_RESTAURANT_BOOKED_MSG = 'Restaurant booking confirmed at {}! Invites sent to {} attendees.'
+_AVAILABILITY_CHECKED_MSG = 'Availability checked for {} team members.'
+
+# Result templates: handlers copy one and fill in the per-call fields, which is
+# cheaper than building a dict literal key by key on every return
+_TEMPLATE_MEETING_OK = {
+    'success': True,
+    'message': '',
+    'event_created': None,
+    'invites_sent': False,
+    'attendee_count': 0
+}
+_TEMPLATE_RESTAURANT_OK = {
+    'success': True,
+    'message': '',
+    'booking_confirmed': True,
+    'booking': None,
+    'invites_sent': False,
+    'attendee_count': 0
+}
+_TEMPLATE_RESTAURANT_FAILED = {
+    'success': False,
+    'message': '',
+    'error': None,
+    'invites_sent': False
+}
+_TEMPLATE_AVAILABILITY_OK = {
+    'success': True,
+    'message': '',
+    'schedules': None,
+    'free_windows': None,
+    'target_date': None,
+    'employee_count': 0,
+    'errors': None
+}
+_CALENDAR_CREATION_FAILED = {
+    'success': False,
+    'message': 'Failed to create calendar event',
+    'error': 'calendar_creation_failed'
+}
+_AVAILABILITY_FIELDS_MISSING = {
+    'success': False,
+    'message': 'Missing required information for availability check',
+    'error': 'missing_required_fields'
+}
+
+# Results for the common no-attendee case
+_EMPTY_ATTENDEE_SUCCESS_MEETING = dict(_TEMPLATE_MEETING_OK, message=_MEETING_SCHEDULED_MSG.format(0), event_created=True)
+_EMPTY_ATTENDEE_SUCCESS_RESTAURANT = _TEMPLATE_RESTAURANT_OK
+
+class ActionType(IntEnum):
+    """Action types understood by ActionExecutor; values index _HANDLERS"""
+    MEETING = 0
+    RESTAURANT = 1
+    AVAILABILITY = 2
+
+# Wire-format action names, mapped to ActionType once at the executor entry
+_STR_TO_ACTION = {
+    'meeting_scheduling': ActionType.MEETING,
+    'restaurant_booking': ActionType.RESTAURANT,
+    'availability_check': ActionType.AVAILABILITY
+}
+
+# Actions that change calendars or send mail; repeats are only deduplicated briefly
+_SIDE_EFFECT_ACTIONS = frozenset((ActionType.MEETING, ActionType.RESTAURANT))
+
+# Meeting invites are sent off the request path. A process-lifetime pool (rather than
+# tasks on the caller's event loop) lets sends finish after run_sync() closes its loop;
+# in-flight futures are held here until done so they can be awaited and aren't lost.
+_INVITE_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='invite-sender')
+_BACKGROUND_TASKS = set()
+
+def _on_background_done(future, label: str):
+    _BACKGROUND_TASKS.discard(future)
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        logger.error("Background %s send failed: %s", label, error, exc_info=error)
+    elif not future.result():
+        logger.warning("Background %s send reported failure", label)
+
+def send_in_background(send, *args, label: str = 'invite'):
+    """
+    Run an email send on the shared background sender pool
+    
+    Args:
+        send: EmailService send method returning True/False
+        *args: Arguments for send
+        label: What the email is for, used when reporting a failed send
+    
+    Returns:
+        Future for the send; failures are reported when it finishes
+    """
+    future = _INVITE_POOL.submit(send, *args)
+    _BACKGROUND_TASKS.add(future)
+    future.add_done_callback(lambda done: _on_background_done(done, label))
+    return future
+
+async def await_pending_invites():
+    """
+    Wait for all background invite sends to finish
+    
+    Returns:
+        List of send results (True/False, or the exception raised)
+    """
+    pending = list(_BACKGROUND_TASKS)
+    if not pending:
+        return []
+    return await asyncio.gather(*(asyncio.wrap_future(f) for f in pending), return_exceptions=True)
+
+def _action_errorwrap(label: str):
+    """
+    Turn exceptions raised by an execute_* coroutine into the standard error result
+    
+    Args:
+        label: What the action was doing, e.g. 'scheduling meeting'
+    
+    Returns:
+        Decorator for async action methods
+    """
+    prefix = f'Error {label}: '
+    
+    def decorator(method):
+        @wraps(method)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await method(*args, **kwargs)
+            except Exception as e:
+                return {
+                    'success': False,
+                    'message': prefix + str(e),
+                    'error': str(e)
+                }
+        return wrapper
+    return decorator
+
+def run_sync(coro):
+    """
+    Run an ActionExecutor coroutine from synchronous code
+    
+    Args:
+        coro: Coroutine returned by one of the execute_* methods
+    
+    Returns:
+        The coroutine's result
+    """
+    # uvloop.run starts only this loop on uvloop, leaving the process-wide policy alone
+    if UVLOOP_AVAILABLE:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
 
 class ActionExecutor:
     """
     Executor that performs the final actions based on user confirmations
+    
+    The execute_* methods are coroutines: blocking service calls run in worker
+    threads so independent I/O can overlap. Use run_sync() from synchronous code.
     """
     
-    def __init__(self):
-        self.calendar_service = CalendarService()
-        self.email_service = EmailService()
-        self.restaurant_service = RestaurantService()
+    def __init__(self, calendar_service: Optional['CalendarService'] = None,
+                 email_service: Optional['EmailService'] = None,
+                 restaurant_service: Optional['RestaurantService'] = None):
+        """
+        Initialize the executor
+        
+        Args:
+            calendar_service: Shared calendar client (created on first use if not given)
+            email_service: Shared email client whose SMTP pool is reused (created on first use if not given)
+            restaurant_service: Shared restaurant client (created on first use if not given)
+        """
+        # Injected clients shadow the lazy properties below
+        if calendar_service is not None:
+            self.calendar_service = calendar_service
+        if email_service is not None:
+            self.email_service = email_service
+        if restaurant_service is not None:
+            self.restaurant_service = restaurant_service
+        
+        # Successful results keyed by a digest of the request: read-only actions are
+        # reused for minutes, side-effecting ones only long enough to absorb double-submits
+        if CACHETOOLS_AVAILABLE:
+            self._result_cache = TTLCache(maxsize=2048, ttl=ACTION_RESULT_CACHE_TTL)
+            self._dedupe_cache = TTLCache(maxsize=256, ttl=ACTION_DEDUPE_TTL)
+        else:
+            self._result_cache = self._dedupe_cache = None
+        self._cache_lock = threading.Lock()
+    
+    @cached_property
+    def calendar_service(self) -> 'CalendarService':
+        # Deferred: constructing the client loads OAuth tokens and builds the API
+        from src.services.calendar_service import CalendarService
+        return CalendarService()
     
-    def execute_meeting_scheduling(self, meeting_details: Dict[str, Any], 
-                                 user_email: str = None) -> Dict[str, Any]:
+    @cached_property
+    def email_service(self) -> 'EmailService':
+        from src.services.email_service import EmailService
+        return EmailService()
+    
+    @cached_property
+    def restaurant_service(self) -> 'RestaurantService':
+        from src.services.restaurant_service import RestaurantService
+        return RestaurantService()
+    
+    def close(self):
+        """Release pooled connections held by the underlying services"""
+        for name in ('email_service', 'restaurant_service', 'calendar_service'):
+            # Only services that were actually created
+            service = self.__dict__.get(name)
+            close = getattr(service, 'close', None)
+            if callable(close):
+                close()
+    
+    def _availability_handler(self, availability_details: Dict[str, Any], user_email: str = None):
+        # Dispatch entry point with the common (details, user_email) signature; returns the
+        # coroutine directly instead of wrapping it in another frame
+        return self.execute_availability_check(availability_details)
+    
+    @_action_errorwrap('scheduling meeting')
+    async def execute_meeting_scheduling(self, meeting_details: Dict[str, Any], 
+                                       user_email: str = None) -> Dict[str, Any]:
         """
         Execute meeting scheduling action
         
@@ -28,43 +264,35 @@ class ActionExecutor:
         Returns:
             Execution results
         """
-        try:
-            # Create calendar event
-            event_created = self.calendar_service.create_event(meeting_details)
-            
-            if not event_created:
-                return {
-                    'success': False,
-                    'message': 'Failed to create calendar event',
-                    'error': 'calendar_creation_failed'
-                }
-            
-            # Send email invites
-            attendee_emails = meeting_details.get('attendees', [])
-            invites_sent = False
-            
-            if attendee_emails:
-                invites_sent = self.email_service.send_meeting_invite(
-                    meeting_details, attendee_emails, user_email or 'assistant@company.com'
-                )
-            
-            return {
-                'success': True,
-                'message': f'Meeting scheduled successfully! Event created and invites sent to {len(attendee_emails)} attendees.',
-                'event_created': event_created,
-                'invites_sent': invites_sent,
-                'attendee_count': len(attendee_emails)
-            }
-            
-        except Exception as e:
-            return {
-                'success': False,
-                'message': f'Error scheduling meeting: {str(e)}',
-                'error': str(e)
-            }
+        # Create calendar event
+        event_created = await asyncio.to_thread(self.calendar_service.create_event, meeting_details)
+        
+        if not event_created:
+            return _CALENDAR_CREATION_FAILED.copy()
+        
+        # Send email invites
+        attendee_emails = meeting_details.get('attendees', [])
+        if not attendee_emails:
+            return dict(_EMPTY_ATTENDEE_SUCCESS_MEETING, event_created=event_created)
+        
+        attendee_count = len(attendee_emails)
+        # The event exists, which is what the user is waiting on; invites go out in the background
+        send_in_background(
+            self.email_service.send_meeting_invite,
+            meeting_details, attendee_emails, user_email or _DEFAULT_SENDER
+        )
+        invites_sent = 'pending'
+        
+        result = _TEMPLATE_MEETING_OK.copy()
+        result['message'] = _MEETING_SCHEDULED_MSG.format(attendee_count)
+        result['event_created'] = event_created
+        result['invites_sent'] = invites_sent
+        result['attendee_count'] = attendee_count
+        return result
     
-    def execute_restaurant_booking(self, restaurant_details: Dict[str, Any],
-                                 user_email: str = None) -> Dict[str, Any]:
+    @_action_errorwrap('booking restaurant')
+    async def execute_restaurant_booking(self, restaurant_details: Dict[str, Any],
+                                       user_email: str = None) -> Dict[str, Any]:
         """
         Execute restaurant booking action
         
@@ -75,36 +303,50 @@ class ActionExecutor:
         Returns:
             Execution results
         """
-        try:
-            # For demo purposes, simulate booking
-            # In a real implementation, you'd integrate with restaurant booking APIs
-            restaurant_name = restaurant_details.get('name', 'Restaurant')
-            
-            # Send dinner invites
-            attendee_emails = restaurant_details.get('attendees', [])
+        restaurant_name = restaurant_details.get('name', 'Restaurant')
+        attendee_emails = restaurant_details.get('attendees', [])
+        attendee_count = len(attendee_emails)
+        
+        if attendee_count:
+            # Booking and dinner invites are independent, so run them side by side
+            booking, invites_sent = await asyncio.gather(
+                asyncio.to_thread(self.restaurant_service.book_restaurant, restaurant_details),
+                asyncio.to_thread(
+                    self.email_service.send_dinner_invite,
+                    restaurant_details, attendee_emails, user_email or _DEFAULT_SENDER
+                ),
+                return_exceptions=True
+            )
+        else:
+            # Nothing to send: book directly without the gather
+            booking = await asyncio.to_thread(self.restaurant_service.book_restaurant, restaurant_details)
+            if booking.get('success'):
+                return dict(_EMPTY_ATTENDEE_SUCCESS_RESTAURANT,
+                            message=_RESTAURANT_BOOKED_MSG.format(restaurant_name, 0),
+                            booking=booking)
             invites_sent = False
-            
-            if attendee_emails:
-                invites_sent = self.email_service.send_dinner_invite(
-                    restaurant_details, attendee_emails, user_email or 'assistant@company.com'
-                )
-            
-            return {
-                'success': True,
-                'message': f'Restaurant booking confirmed at {restaurant_name}! Invites sent to {len(attendee_emails)} attendees.',
-                'booking_confirmed': True,
-                'invites_sent': invites_sent,
-                'attendee_count': len(attendee_emails)
-            }
-            
-        except Exception as e:
-            return {
-                'success': False,
-                'message': f'Error booking restaurant: {str(e)}',
-                'error': str(e)
-            }
+        
+        # Check each result separately so one failure doesn't hide the other
+        if isinstance(invites_sent, Exception):
+            logger.error("Dinner invites failed: %s", invites_sent, exc_info=invites_sent)
+            invites_sent = False
+        if isinstance(booking, Exception) or not booking.get('success'):
+            error = str(booking) if isinstance(booking, Exception) else booking.get('error', 'booking_failed')
+            result = _TEMPLATE_RESTAURANT_FAILED.copy()
+            result['message'] = f'Failed to book {restaurant_name}: {error}'
+            result['error'] = error
+            result['invites_sent'] = invites_sent
+            return result
+        
+        result = _TEMPLATE_RESTAURANT_OK.copy()
+        result['message'] = _RESTAURANT_BOOKED_MSG.format(restaurant_name, attendee_count)
+        result['booking'] = booking
+        result['invites_sent'] = invites_sent
+        result['attendee_count'] = attendee_count
+        return result
     
-    def execute_availability_check(self, availability_details: Dict[str, Any]) -> Dict[str, Any]:
+    @_action_errorwrap('checking availability')
+    async def execute_availability_check(self, availability_details: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute availability checking action
         
@@ -114,62 +356,108 @@ class ActionExecutor:
         Returns:
             Execution results
         """
-        try:
-            employee_emails = availability_details.get('employees', [])
-            target_date = availability_details.get('date')
-            
-            if not target_date or not employee_emails:
-                return {
-                    'success': False,
-                    'message': 'Missing required information for availability check',
-                    'error': 'missing_required_fields'
-                }
-            
-            # Get schedules for all employees
-            schedules = {}
-            for email in employee_emails:
-                schedule = self.calendar_service.get_user_schedule(
-                    email, target_date, target_date
-                )
-                schedules[email] = schedule
-            
-            return {
-                'success': True,
-                'message': f'Availability checked for {len(employee_emails)} team members.',
-                'schedules': schedules,
-                'target_date': target_date,
-                'employee_count': len(employee_emails)
-            }
-            
-        except Exception as e:
-            return {
-                'success': False,
-                'message': f'Error checking availability: {str(e)}',
-                'error': str(e)
-            }
+        employee_emails = availability_details.get('employees', [])
+        target_date = availability_details.get('date')
+        
+        if not target_date or not employee_emails:
+            return _AVAILABILITY_FIELDS_MISSING.copy()
+        
+        employee_count = len(employee_emails)
+        
+        # Busy intervals for the whole team in a single FreeBusy round trip; calendars
+        # that can't be read are reported per employee instead of failing the check
+        errors = {}
+        schedules = await asyncio.to_thread(
+            self.calendar_service.get_team_freebusy, employee_emails, target_date, errors
+        )
+        free_windows = self.calendar_service.find_common_free_windows(schedules, target_date)
+        
+        result = _TEMPLATE_AVAILABILITY_OK.copy()
+        result['message'] = _AVAILABILITY_CHECKED_MSG.format(employee_count)
+        result['schedules'] = schedules
+        result['free_windows'] = free_windows
+        result['target_date'] = target_date
+        result['employee_count'] = employee_count
+        result['errors'] = errors
+        return result
     
-    def execute_action(self, action_type: str, action_details: Dict[str, Any],
-                      user_email: str = None) -> Dict[str, Any]:
+    async def execute_action(self, action_type, action_details: Dict[str, Any],
+                             user_email: str = None) -> Dict[str, Any]:
         """
         Execute an action based on type
         
         Args:
-            action_type: Type of action to execute
+            action_type: Type of action to execute (ActionType or its wire name, e.g. 'meeting_scheduling')
             action_details: Action details
             user_email: User's email address
         
         Returns:
             Execution results
         """
-        if action_type == 'meeting_scheduling':
-            return self.execute_meeting_scheduling(action_details, user_email)
-        elif action_type == 'restaurant_booking':
-            return self.execute_restaurant_booking(action_details, user_email)
-        elif action_type == 'availability_check':
-            return self.execute_availability_check(action_details)
-        else:
+        action = action_type if isinstance(action_type, ActionType) else _STR_TO_ACTION.get(action_type)
+        if action is None:
             return {
                 'success': False,
                 'message': f'Unknown action type: {action_type}',
                 'error': 'unknown_action_type'
-            } 
\ No newline at end of file
+            }
+        handler = _HANDLERS[action]
+        
+        if self._result_cache is None:
+            return await handler(self, action_details, user_email)
+        
+        has_side_effects = action in _SIDE_EFFECT_ACTIONS
+        cache = self._dedupe_cache if has_side_effects else self._result_cache
+        key = self._result_cache_key(action, action_details, user_email)
+        with self._cache_lock:
+            cached = cache.get(key)
+        if cached is not None:
+            return dict(cached)
+        
+        result = await handler(self, action_details, user_email)
+        # Partial results (some calendars unreadable) are not worth reusing
+        if result.get('success') and not result.get('errors'):
+            with self._cache_lock:
+                cache[key] = dict(result)
+                if has_side_effects:
+                    # Calendars changed, so earlier availability results are stale
+                    self._result_cache.clear()
+        return result
+    
+    @staticmethod
+    def _result_cache_key(action: ActionType, action_details: Dict[str, Any], user_email: Optional[str]) -> str:
+        payload = json.dumps({'t': int(action), 'd': action_details, 'u': user_email},
+                             sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+# Handlers indexed by ActionType, each called as handler(executor, action_details, user_email)
+_HANDLERS = (
+    ActionExecutor.execute_meeting_scheduling,
+    ActionExecutor.execute_restaurant_booking,
+    ActionExecutor._availability_handler
+)
+
+
+# Process-wide executor shared by callers that don't manage their own
+_instance = None
+_instance_lock = threading.Lock()
+
+def get_action_executor() -> ActionExecutor:
+    """
+    Get the shared ActionExecutor, creating it on first use
+    
+    Service clients are still created lazily, and their pooled connections are
+    closed when the process exits.
+    
+    Returns:
+        The process-wide ActionExecutor
+    """
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                executor = ActionExecutor()
+                atexit.register(executor.close)
+                _instance = executor
+    return _instance
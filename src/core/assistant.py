@@ -2,12 +2,17 @@
 Main Assistant Coordinator for the Proactive Work-Life Assistant
 """
 import os
+import time
+from collections import deque
+from functools import cached_property, lru_cache
 from typing import Dict, Any, List, Optional
 from datetime import datetime, date
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from dateutil.parser import parse as dateutil_parse
 from .goal_parser import GoalParser
 from .task_planner import TaskPlanner
-from .action_executor import ActionExecutor
+from .action_executor import ActionExecutor, send_in_background
 from .user_manager import UserManager
 from src.utils.name_matcher import NameMatcher
 from .confirmation_handler import ConfirmationHandler
@@ -18,13 +23,158 @@ from src.services.location_service import LocationService
 from src.services.restaurant_service import RestaurantService
 from src.utils.logger import setup_logger
 from src.utils.formatters import format_success_message, format_error_message
+from src.utils.validators import validate_email
+from config.settings import ASSISTANT_HISTORY_MAX, VETTED_SLOT_TTL
 import json
+import re
+
+# First {...} object in a model response, tolerating ```json fences and surrounding prose
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+# 24-hour "H:MM"/"HH:MM" slot times as produced by the time-slot picker
+_HHMM_RE = re.compile(r'(\d{1,2}):(\d{2})')
+
+# Resolved once; the data directories live under the project root
+BASE_DIR = Path(__file__).parent.parent.parent
+
+@lru_cache(maxsize=None)
+def _get_singleton(cls):
+    """Return the process-wide instance of a stateless component or service class"""
+    return cls()
+
+# Gemini prompt for personalized emails; the invariant part is shared (and cached) across recipients
+_EMAIL_PROMPT_TMPL = (
+    "Write a short, clear, personalized email from {sender_name}{with_company}. "
+    "The purpose of the email is: {user_content}. "
+    "If the user provides keywords or bullet points, expand them into a full, natural, friendly email. Do NOT use any placeholders or generic text like [Your Name], [Recipient Name], [Company], etc. Do NOT use a fixed template. Only use the data provided. If you have any content at all, generate the email. If you do not have any content, return a JSON with 'missing_fields' and do not generate the email. Return a JSON with 'subject' and 'body'.\n"
+)
+_EMAIL_RECIPIENT_TMPL = "Recipient: {rec_name} (email: {rec_email}). Return JSON."
+# One cheap up-front check; the answer doesn't depend on the recipient
+_EMAIL_SUFFICIENCY_TMPL = (
+    "Given this purpose for an email: {user_content}. "
+    "Is it sufficient to draft the email without placeholders? "
+    "Return only a JSON {{\"sufficient\": true or false, \"missing_fields\": [\"...\"]}}."
+)
+
+# Fixed responses; handlers return copies since callers may add keys
+_CANCELLATION_TMPL = """
+Dear Team,
+
+The following event has been cancelled:
+- Title: {title}
+- Date: {date}
+- Time: {time}
+- Location: {location}
+
+We apologize for any inconvenience.
+
+Best regards,
+{sender}
+"""
+
+_UNDERSTOOD_NOTHING = {
+    'success': False,
+    'message': "I couldn't understand your request. Could you please rephrase it?",
+    'next_action': 'clarify'
+}
+_NO_PLAN = {
+    'success': False,
+    'message': "I couldn't create a plan for your request. Please provide more details.",
+    'next_action': 'clarify'
+}
+_MEETING_DATE_MISSING = {
+    'success': False,
+    'message': 'Please specify a date for the meeting.',
+    'next_action': 'clarify'
+}
+_DATE_UNPARSEABLE = {
+    'success': False,
+    'message': "Could not parse the date. Please provide a valid date (e.g., '2023-10-27' or 'next Monday').",
+    'next_action': 'clarify'
+}
+_NO_SLOTS_FOUND = {
+    'success': False,
+    'message': 'No available time slots found for the specified date and attendees.',
+    'next_action': 'suggest_alternatives'
+}
+_AVAILABILITY_DATE_MISSING = {
+    'success': False,
+    'message': 'Please specify a date to check availability.',
+    'next_action': 'clarify'
+}
+_NO_TIME_SELECTED = {
+    'success': False,
+    'message': 'No time slot selected. Please select a time slot for the meeting.',
+    'next_action': 'clarify'
+}
+_MEETING_CONFIRMED = {
+    'success': True,
+    'message': 'Meeting scheduled and calendar event created; notification email is being sent to all attendees.',
+    'next_action': 'complete',
+    'email_status': 'queued'
+}
+_MEETING_EVENT_FAILED = {
+    'success': False,
+    'message': 'Failed to schedule meeting: could not create calendar event, so no invites were sent.',
+    'next_action': 'error'
+}
+_SLOT_TAKEN = {
+    'success': False,
+    'message': 'The selected time slot is no longer available for all attendees. Please choose another slot.',
+    'next_action': 'select_time_slot'
+}
+_EVENT_DELETED = {
+    'success': True,
+    'message': "Event deleted; attendees are being notified.",
+    'next_action': 'complete',
+    'email_status': 'queued'
+}
+_BOOKING_DATE_UNPARSEABLE = {
+    'success': False,
+    'message': "Could not parse the booking date. Please provide a valid date (e.g., '2023-10-27' or 'next Monday').",
+    'next_action': 'clarify'
+}
+_BOOKING_TIME_UNPARSEABLE = {
+    'success': False,
+    'message': "Could not parse the booking time. Please provide a valid time (e.g., '18:00' or '6 PM').",
+    'next_action': 'clarify'
+}
+
+# Exact formats tried before dateutil, as (strptime format, whether the string carries a date)
+_FAST_DATE_FORMATS = (('%Y-%m-%d', True), ('%H:%M', False), ('%Y-%m-%d %H:%M', True))
+
+@lru_cache(maxsize=8192)
+def _parse_fuzzy(date_str: str, today_iso: str) -> Optional[date]:
+    """
+    Parse a natural-language date string, memoized per calendar day
+    
+    Args:
+        date_str: Date string to parse
+        today_iso: Today's ISO date; part of the cache key because dateutil fills
+            missing fields from today, so results are only valid for that day
+    
+    Returns:
+        Date object or None if parsing fails
+    """
+    # Common machine formats skip dateutil; a bare time means today, as dateutil would give
+    for fmt, has_date in _FAST_DATE_FORMATS:
+        try:
+            parsed = datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+        return parsed.date() if has_date else date.fromisoformat(today_iso)
+    try:
+        return dateutil_parse(date_str, fuzzy=True).date()
+    except Exception:
+        return None
 
 class Assistant:
     """
     Main assistant coordinator that orchestrates all operations
     """
     
+    # Set once the data directories have been created in this process
+    _dirs_ready = False
+    
     def __init__(self):
         # Initialize logger
         self.logger = setup_logger("assistant")
@@ -32,49 +182,96 @@ class Assistant:
         # Ensure data directories exist
         self._ensure_data_directories()
         
-        # Initialize core components
-        self.goal_parser = GoalParser()
-        self.task_planner = TaskPlanner()
-        self.action_executor = ActionExecutor()
-        self.user_manager = UserManager()
-        self.name_matcher = NameMatcher()  # Use enhanced NameMatcher instead of EmployeeFilter
-        self.confirmation_handler = ConfirmationHandler()
-        
-        # Initialize services
-        self.ai_service = AIService()
-        self.calendar_service = CalendarService()
-        self.email_service = EmailService()
-        self.location_service = LocationService()
-        self.restaurant_service = RestaurantService()
+        # Core components and services are created lazily on first use (see properties below)
         
         # Initialize state
         self.current_session = None
-        self.conversation_history = []
+        self.conversation_history = deque(maxlen=ASSISTANT_HISTORY_MAX)
+        # Email drafting asks the user for missing details only once per round
+        self._asked_for_missing_fields = False
+        # Slots just offered to the user: (date, start, end) -> (offered at, attendees checked)
+        self._vetted_slots = {}
+        
+        # Task/action type -> handler dispatch tables
+        self._plan_dispatch = {
+            'meeting_scheduling': self._handle_meeting_scheduling,
+            'restaurant_booking': self._handle_restaurant_booking,
+            'availability_check': self._handle_availability_check,
+            'send_email': self._handle_send_email
+        }
+        self._confirm_dispatch = {
+            'meeting_scheduling': self._confirm_meeting_scheduling,
+            'restaurant_booking': self._confirm_restaurant_booking
+        }
         
         self.logger.info("Assistant initialized successfully")
     
+    # Core components; parsers and matchers are shared, per-session state is not
+    @cached_property
+    def goal_parser(self):
+        return _get_singleton(GoalParser)
+    
+    @cached_property
+    def task_planner(self):
+        return _get_singleton(TaskPlanner)
+    
+    @cached_property
+    def user_manager(self):
+        return UserManager()
+    
+    @cached_property
+    def name_matcher(self):
+        return _get_singleton(NameMatcher)  # Use enhanced NameMatcher instead of EmployeeFilter
+    
+    @cached_property
+    def confirmation_handler(self):
+        return ConfirmationHandler()
+    
+    # Services; shared across reruns so API clients and pools are built once
+    @cached_property
+    def ai_service(self):
+        return _get_singleton(AIService)
+    
+    @cached_property
+    def calendar_service(self):
+        return _get_singleton(CalendarService)
+    
+    @cached_property
+    def email_service(self):
+        return _get_singleton(EmailService)
+    
+    @cached_property
+    def location_service(self):
+        return _get_singleton(LocationService)
+    
+    @cached_property
+    def restaurant_service(self):
+        return _get_singleton(RestaurantService)
+    
+    @cached_property
+    def action_executor(self):
+        # Share service clients (and their pooled connections) with the executor
+        return ActionExecutor(
+            calendar_service=self.calendar_service,
+            email_service=self.email_service,
+            restaurant_service=self.restaurant_service
+        )
+    
     def _ensure_data_directories(self):
         """Ensure all required data directories exist"""
+        # Later instances (e.g. Streamlit reruns) skip the stat/mkdir syscalls entirely
+        if Assistant._dirs_ready:
+            return
         try:
-            # Get base directory
-            base_dir = Path(__file__).parent.parent.parent
-            
-            # Create data directories
-            data_dirs = [
-                base_dir / "data",
-                base_dir / "data" / "users",
-                base_dir / "data" / "calendar",
-                base_dir / "data" / "emails",
-                base_dir / "data" / "restaurants"
-            ]
+            # Create data directories; makedirs creates "data" itself along the way
+            for sub_dir in ("users", "calendar", "emails", "restaurants"):
+                os.makedirs(os.path.join(BASE_DIR, "data", sub_dir), exist_ok=True)
             
-            for dir_path in data_dirs:
-                dir_path.mkdir(parents=True, exist_ok=True)
-                
+            Assistant._dirs_ready = True
             self.logger.info("Data directories ensured")
             
         except Exception as e:
-            self.logger.error(f"Error creating data directories: {e}")
+            self.logger.error("Error creating data directories: %s", e)
     
     def _convert_date_string_to_date(self, date_str: str) -> Optional[date]:
         """
@@ -96,12 +293,10 @@ class Assistant:
             # if parsed_date:
             #     return parsed_date
             # If that fails, try dateutil
-            try:
-                from dateutil.parser import parse as dateutil_parse
-                return dateutil_parse(date_str, fuzzy=True).date()
-            except Exception:
-                self.logger.error(f"Could not parse date: {date_str}")
-                return None
+            parsed_date = _parse_fuzzy(date_str, date.today().isoformat())
+            if parsed_date is None:
+                self.logger.error("Could not parse date: %s", date_str)
+            return parsed_date
         return None
     
     def process_user_query(self, user_query: str, user_email: str = None) -> Dict[str, Any]:
@@ -116,11 +311,11 @@ class Assistant:
             Dictionary with response and next actions
         """
         try:
-            self.logger.info(f"Processing user query: {user_query}")
+            self.logger.info("Processing user query: %s", user_query)
             
-            # Add to conversation history
+            # Add to conversation history (timestamp is formatted when the history is read)
             self.conversation_history.append({
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': datetime.now(),
                 'user_query': user_query,
                 'user_email': user_email
             })
@@ -129,11 +324,7 @@ class Assistant:
             goal_info = self.goal_parser.parse_goal(user_query)
             
             if not goal_info:
-                return {
-                    'success': False,
-                    'message': "I couldn't understand your request. Could you please rephrase it?",
-                    'next_action': 'clarify'
-                }
+                return _UNDERSTOOD_NOTHING.copy()
             
             # Step 2: Extract employee names if mentioned
             if goal_info.get('type') in ['meeting', 'dinner']:
@@ -146,11 +337,7 @@ class Assistant:
             task_plan = self.task_planner.create_plan(goal_info)
             
             if not task_plan:
-                return {
-                    'success': False,
-                    'message': "I couldn't create a plan for your request. Please provide more details.",
-                    'next_action': 'clarify'
-                }
+                return _NO_PLAN.copy()
             
             # Step 4: Execute the plan
             result = self._execute_plan(task_plan, user_email)
@@ -158,10 +345,10 @@ class Assistant:
             return result
             
         except Exception as e:
-            self.logger.error(f"Error processing user query: {e}")
+            self.logger.error("Error processing user query: %s", e)
             return {
                 'success': False,
-                'message': format_error_message(f"An error occurred: {str(e)}"),
+                'message': format_error_message(f"An error occurred: {e}"),
                 'next_action': 'error'
             }
     
@@ -179,14 +366,9 @@ class Assistant:
         try:
             task_type = task_plan.get('type')
             
-            if task_type == 'meeting_scheduling':
-                return self._handle_meeting_scheduling(task_plan, user_email)
-            elif task_type == 'restaurant_booking':
-                return self._handle_restaurant_booking(task_plan, user_email)
-            elif task_type == 'availability_check':
-                return self._handle_availability_check(task_plan, user_email)
-            elif task_type == 'send_email':
-                return self._handle_send_email(task_plan, user_email)
+            handler = self._plan_dispatch.get(task_type)
+            if handler:
+                return handler(task_plan, user_email)
             else:
                 return {
                     'success': False,
@@ -195,13 +377,55 @@ class Assistant:
                 }
                 
         except Exception as e:
-            self.logger.error(f"Error executing plan: {e}")
+            self.logger.error("Error executing plan: %s", e)
             return {
                 'success': False,
-                'message': format_error_message(f"Error executing plan: {str(e)}"),
+                'message': format_error_message(f"Error executing plan: {e}"),
                 'next_action': 'error'
             }
 
+    def _missing_email_fields(self, user_content: str) -> List[str]:
+        """
+        Ask Gemini once whether the email purpose has enough detail to draft from
+        
+        Args:
+            user_content: What the user wants the email to say
+        
+        Returns:
+            Missing fields, or an empty list if the content is sufficient or the check fails
+        """
+        response = self.ai_service._generate_with_gemini(
+            _EMAIL_SUFFICIENCY_TMPL.format_map({'user_content': user_content})
+        )
+        json_match = _JSON_OBJECT_RE.search(response or '')
+        if not json_match:
+            return []
+        try:
+            verdict = json.loads(json_match.group(0))
+        except ValueError:
+            return []
+        if verdict.get('sufficient', True):
+            return []
+        return verdict.get('missing_fields') or ['More details about the email']
+    
+    def _missing_fields_response(self, missing_fields: List[str]) -> Dict[str, Any]:
+        """Prompt the user for missing email details, or fail if they were already asked"""
+        if self._asked_for_missing_fields:
+            # If already asked, just fail gracefully
+            return {
+                'success': False,
+                'message': 'Could not generate the email. Please provide more details.',
+                'next_action': 'error',
+                'missing_fields': missing_fields
+            }
+        self._asked_for_missing_fields = True
+        return {
+            'success': False,
+            'message': f"Please provide the following missing information: {', '.join(missing_fields)}",
+            'next_action': 'input_missing_fields',
+            'missing_fields': missing_fields
+        }
+    
     def _handle_send_email(self, task_plan: Dict[str, Any], user_email: str = None) -> Dict[str, Any]:
         """Handle sending email tasks using Gemini for all content and subject, with personalized mails."""
         try:
@@ -218,33 +442,29 @@ class Assistant:
             # Build recipient_emails and recipient_names from team_contacts.json
             recipient_emails = []
             recipient_names = []
-            from src.utils.validators import validate_email
-            for r in recipients:
+            seen_emails = set()
+            # Repeated recipients (and a name plus that person's email) are resolved and mailed once
+            for r in dict.fromkeys(recipients):
                 if '@' in r and validate_email(r):
+                    if r.lower() in seen_emails:
+                        continue
+                    seen_emails.add(r.lower())
                     recipient_emails.append(r)
                     # Get name from team_contacts.json
-                    name = self.name_matcher.team_contacts.get(r.lower(), {}).get('name')
-                    if not name:
-                        # Try to find by email in team_contacts
-                        for member in self.name_matcher.get_team_members():
-                            if member['email'].lower() == r.lower():
-                                name = member['name']
-                                break
+                    name = (self.name_matcher.team_contacts.get(r.lower(), {}).get('name')
+                            or self.name_matcher.get_name_for_email(r))
                     recipient_names.append(name or r)
                 else:
                     email = self.name_matcher.get_email_for_name(r)
-                    if email:
+                    if email and email.lower() not in seen_emails:
+                        seen_emails.add(email.lower())
                         recipient_emails.append(email)
                         # Get name from team_contacts.json
-                        name = self.name_matcher.team_contacts.get(r.lower(), {}).get('name')
-                        if not name:
-                            for member in self.name_matcher.get_team_members():
-                                if member['email'].lower() == email.lower():
-                                    name = member['name']
-                                    break
+                        name = (self.name_matcher.team_contacts.get(r.lower(), {}).get('name')
+                                or self.name_matcher.get_name_for_email(email))
                         recipient_names.append(name or r)
 
-            print(f"[Assistant] Final recipient_emails: {recipient_emails}, recipient_names: {recipient_names}")
+            self.logger.debug("recipients=%s names=%s", recipient_emails, recipient_names)
             if not recipient_emails:
                 return {
                     'success': False,
@@ -263,9 +483,8 @@ class Assistant:
                 sender_email = self.user_manager.get_email_by_name(sender_name)
             if not sender_name:
                 # fallback: use the first user in user_profiles.json
-                users = self.user_manager.user_profiles.get("users", {})
-                if users:
-                    profile = list(users.values())[0]
+                profile = self.user_manager.default_sender
+                if profile:
                     sender_name = profile.get('name')
                     if not sender_email:
                         sender_email = profile.get('email')
@@ -281,82 +500,64 @@ class Assistant:
                     'next_action': 'clarify',
                     'missing_info': missing_info
                 }
-            # Send personalized email to each recipient
-            all_sent = True
-            failed_recipients = []
-            for rec_email, rec_name in zip(recipient_emails, recipient_names):
-                # Prepare details for Gemini
-                gemini_details = details.copy()
-                gemini_details['recipient_name'] = rec_name
-                gemini_details['recipient_email'] = rec_email
-                gemini_details['sender_name'] = sender_name
-                if company_name:
-                    gemini_details['company_name'] = company_name
-                # Check if user provided any keywords or bullet points in the message/details
-                user_content = details.get('message', '').strip()
-                # If no content, force Gemini to ask for info (only once)
-                if not user_content or user_content.lower() in ['explain this project in detail', 'explaining this project in detail']:
-                    return {
-                        'success': False,
-                        'message': 'Please provide some keywords, bullet points, or a brief description of the project so I can draft the email.',
-                        'next_action': 'input_missing_fields',
-                        'missing_fields': ['Project details (keywords, bullet points, or description)']
-                    }
-                if company_name:
-                    gemini_prompt = (
-                        f"Write a short, clear, personalized email to {rec_name} (email: {rec_email}) from {sender_name} at {company_name}. "
-                        f"The purpose of the email is: {user_content}. "
-                        f"If the user provides keywords or bullet points, expand them into a full, natural, friendly email. Do NOT use any placeholders or generic text like [Your Name], [Recipient Name], [Company], etc. Do NOT use a fixed template. Only use the data provided. If you have any content at all, generate the email. If you do not have any content, return a JSON with 'missing_fields' and do not generate the email. Return a JSON with 'subject' and 'body'."
-                    )
-                else:
-                    gemini_prompt = (
-                        f"Write a short, clear, personalized email to {rec_name} (email: {rec_email}) from {sender_name}. "
-                        f"The purpose of the email is: {user_content}. "
-                        f"If the user provides keywords or bullet points, expand them into a full, natural, friendly email. Do NOT use any placeholders or generic text like [Your Name], [Recipient Name], [Company], etc. Do NOT use a fixed template. Only use the data provided. If you have any content at all, generate the email. If you do not have any content, return a JSON with 'missing_fields' and do not generate the email. Return a JSON with 'subject' and 'body'."
-                    )
-                gemini_response = self.ai_service._generate_with_gemini(gemini_prompt)
+            # Check if user provided any keywords or bullet points in the message/details
+            user_content = details.get('message', '').strip()
+            # If no content, force Gemini to ask for info (only once)
+            if not user_content or user_content.lower() in ['explain this project in detail', 'explaining this project in detail']:
+                return {
+                    'success': False,
+                    'message': 'Please provide some keywords, bullet points, or a brief description of the project so I can draft the email.',
+                    'next_action': 'input_missing_fields',
+                    'missing_fields': ['Project details (keywords, bullet points, or description)']
+                }
+            # Ask once whether the content is enough before drafting N emails that would all say no
+            if len(recipient_emails) > 1:
+                missing_fields = self._missing_email_fields(user_content)
+                if missing_fields:
+                    return self._missing_fields_response(missing_fields)
+            # Invariant instructions go first so Gemini can cache the shared prefix;
+            # only the short recipient line differs per email
+            shared_prefix = _EMAIL_PROMPT_TMPL.format_map({
+                'sender_name': sender_name,
+                'with_company': f" at {company_name}" if company_name else "",
+                'user_content': user_content
+            })
+            recipient_suffixes = [
+                _EMAIL_RECIPIENT_TMPL.format_map({'rec_name': rec_name, 'rec_email': rec_email})
+                for rec_email, rec_name in zip(recipient_emails, recipient_names)
+            ]
+            gemini_responses = self.ai_service._generate_with_shared_prefix(shared_prefix, recipient_suffixes)
+            # Turn each response into a (recipient, subject, body) send job
+            send_jobs = []
+            for rec_email, rec_name, gemini_response in zip(recipient_emails, recipient_names, gemini_responses):
                 try:
-                    import json
                     gemini_response_clean = gemini_response.strip()
-                    if gemini_response_clean.startswith('```json'):
-                        gemini_response_clean = gemini_response_clean[7:]
-                    if gemini_response_clean.endswith('```'):
-                        gemini_response_clean = gemini_response_clean[:-3]
-                    gemini_json = json.loads(gemini_response_clean)
-                    # If Gemini returns missing_fields, prompt user for input (only once)
+                    json_match = _JSON_OBJECT_RE.search(gemini_response_clean)
+                    if not json_match:
+                        raise ValueError("No JSON object in Gemini response")
+                    gemini_json = json.loads(json_match.group(0))
+                    # If Gemini returns missing_fields, prompt user for input (only once); nothing is sent yet
                     if 'missing_fields' in gemini_json and gemini_json['missing_fields']:
-                        if st.session_state.get('already_asked_for_missing', False):
-                            # If already asked, just fail gracefully
-                            return {
-                                'success': False,
-                                'message': 'Could not generate the email. Please provide more details.',
-                                'next_action': 'error',
-                                'missing_fields': gemini_json['missing_fields']
-                            }
-                        else:
-                            st.session_state['already_asked_for_missing'] = True
-                            return {
-                                'success': False,
-                                'message': f"Please provide the following missing information: {', '.join(gemini_json['missing_fields'])}",
-                                'next_action': 'input_missing_fields',
-                                'missing_fields': gemini_json['missing_fields']
-                            }
+                        return self._missing_fields_response(gemini_json['missing_fields'])
                     subject = gemini_json.get('subject', 'No Subject')
                     content = gemini_json.get('body', gemini_response_clean)
                 except Exception:
                     # Fallback: treat all as body
                     subject = f"Message for {rec_name}"
                     content = gemini_response
-                sent = self.email_service.send_email(
-                    to_emails=[rec_email],
-                    subject=subject,
-                    content=content,
-                    from_email=sender_email or 'assistant@company.com'
-                )
-                if not sent:
-                    all_sent = False
-                    failed_recipients.append(rec_email)
-            if all_sent:
+                send_jobs.append((rec_email, subject, content))
+            # Send personalized emails concurrently
+            from_email = sender_email or 'assistant@company.com'
+            with ThreadPoolExecutor(max_workers=min(16, len(send_jobs))) as executor:
+                results = list(executor.map(
+                    lambda job: (job[0], self.email_service.send_email(
+                        to_emails=[job[0]], subject=job[1], content=job[2], from_email=from_email
+                    )),
+                    send_jobs
+                ))
+            failed_recipients = [rec_email for rec_email, sent in results if not sent]
+            if not failed_recipients:
+                self._asked_for_missing_fields = False
                 return {
                     'success': True,
                     'message': f"Personalized email(s) sent to {', '.join(recipient_emails)}.",
@@ -370,10 +571,10 @@ class Assistant:
                     'failed_recipients': failed_recipients
                 }
         except Exception as e:
-            self.logger.error(f"Error sending email: {e}")
+            self.logger.error("Error sending email: %s", e)
             return {
                 'success': False,
-                'message': format_error_message(f"Error sending email: {str(e)}"),
+                'message': format_error_message(f"Error sending email: {e}"),
                 'next_action': 'error'
             }
     
@@ -388,20 +589,12 @@ class Assistant:
             target_date_str = meeting_details.get('date')
 
             if not target_date_str:
-                return {
-                    'success': False,
-                    'message': "Please specify a date for the meeting.",
-                    'next_action': 'clarify'
-                }
+                return _MEETING_DATE_MISSING.copy()
 
             target_date = self._convert_date_string_to_date(target_date_str)
 
             if not target_date:
-                return {
-                    'success': False,
-                    'message': "Could not parse the date. Please provide a valid date (e.g., '2023-10-27' or 'next Monday').",
-                    'next_action': 'clarify'
-                }
+                return _DATE_UNPARSEABLE.copy()
 
             # Check availability
             available_slots = self.calendar_service.find_available_slots(
@@ -411,11 +604,8 @@ class Assistant:
             )
 
             if not available_slots:
-                return {
-                    'success': False,
-                    'message': "No available time slots found for the specified date and attendees.",
-                    'next_action': 'suggest_alternatives'
-                }
+                return _NO_SLOTS_FOUND.copy()
+            self._remember_vetted_slots(target_date, available_slots, employee_emails + [user_email])
 
             # Present options to user (show all slots)
             options = []
@@ -436,10 +626,10 @@ class Assistant:
             }
 
         except Exception as e:
-            self.logger.error(f"Error handling meeting scheduling: {e}")
+            self.logger.error("Error handling meeting scheduling: %s", e)
             return {
                 'success': False,
-                'message': format_error_message(f"Error scheduling meeting: {str(e)}"),
+                'message': format_error_message(f"Error scheduling meeting: {e}"),
                 'next_action': 'error'
             }
     
@@ -460,20 +650,20 @@ class Assistant:
                     'missing_info': ['location']
                 }
             # Search for restaurants using all available APIs (Google, OpenTripMap, Foursquare)
-            self.logger.info(f"Searching restaurants using available APIs: {self.restaurant_service.available_apis}")
+            self.logger.info("Searching restaurants using available APIs: %s", self.restaurant_service.available_apis)
             restaurants = self.restaurant_service.search_restaurants(
                 location=location,
                 cuisine=cuisine,
                 min_rating=3.5
             )
-            self.logger.info(f"Found {len(restaurants)} restaurants from APIs: {self.restaurant_service.available_apis}")
+            self.logger.info("Found %s restaurants from APIs: %s", len(restaurants), self.restaurant_service.available_apis)
             if restaurants:
                 # Clean the restaurant data for logging to avoid Unicode issues
                 sample_restaurant = restaurants[0].copy()
                 # Remove problematic fields that might contain Unicode characters
                 sample_restaurant.pop('reviews', None)
                 sample_restaurant.pop('opening_hours', None)
-                self.logger.info(f"Sample restaurant: {sample_restaurant.get('name', 'Unknown')} - {sample_restaurant.get('rating', 0)}★ - {sample_restaurant.get('source', 'unknown')}")
+                self.logger.info("Sample restaurant: %s - %s★ - %s", sample_restaurant.get('name', 'Unknown'), sample_restaurant.get('rating', 0), sample_restaurant.get('source', 'unknown'))
             if not restaurants:
                 return {
                     'success': False,
@@ -506,8 +696,8 @@ class Assistant:
                 # If employees is the special flag, we'll handle this after restaurant selection
                 if not (employees and employees[0] == "__ASK_USER_FOR_EMPLOYEE__"):
                     # If 'everyone' or similar, get all team emails
-                    if set(employees) == set([member['name'] for member in self.name_matcher.get_team_members()]):
-                        attendee_emails = [member['email'] for member in self.name_matcher.get_team_members()]
+                    if self.name_matcher.is_whole_team(employees):
+                        attendee_emails = list(self.name_matcher.team_email_list)
                     else:
                         attendee_emails = self.name_matcher.get_emails_for_names(employees)
             
@@ -523,10 +713,10 @@ class Assistant:
                 'needs_employees': not attendee_emails  # Flag to indicate if we need to ask for employees later
             }
         except Exception as e:
-            self.logger.error(f"Error handling restaurant booking: {e}")
+            self.logger.error("Error handling restaurant booking: %s", e)
             return {
                 'success': False,
-                'message': format_error_message(f"Error searching restaurants: {str(e)}"),
+                'message': format_error_message(f"Error searching restaurants: {e}"),
                 'next_action': 'error'
             }
     
@@ -539,28 +729,15 @@ class Assistant:
             target_date_str = availability_details.get('date')
             
             if not target_date_str:
-                return {
-                    'success': False,
-                    'message': "Please specify a date to check availability.",
-                    'next_action': 'clarify'
-                }
+                return _AVAILABILITY_DATE_MISSING.copy()
             
             target_date = self._convert_date_string_to_date(target_date_str)
             
             if not target_date:
-                return {
-                    'success': False,
-                    'message': "Could not parse the date. Please provide a valid date (e.g., '2023-10-27' or 'next Monday').",
-                    'next_action': 'clarify'
-                }
+                return _DATE_UNPARSEABLE.copy()
             
-            # Get user schedules
-            schedules = {}
-            for email in employee_emails:
-                schedule = self.calendar_service.get_user_schedule(
-                    email, target_date, target_date
-                )
-                schedules[email] = schedule
+            # Get user schedules (batched into as few HTTP round trips as possible)
+            schedules = self.calendar_service.batch_get_schedules(employee_emails, target_date)
             
             return {
                 'success': True,
@@ -571,10 +748,10 @@ class Assistant:
             }
             
         except Exception as e:
-            self.logger.error(f"Error handling availability check: {e}")
+            self.logger.error("Error handling availability check: %s", e)
             return {
                 'success': False,
-                'message': format_error_message(f"Error checking availability: {str(e)}"),
+                'message': format_error_message(f"Error checking availability: {e}"),
                 'next_action': 'error'
             }
     
@@ -592,10 +769,9 @@ class Assistant:
             Dictionary with confirmation results
         """
         try:
-            if action_type == 'meeting_scheduling':
-                return self._confirm_meeting_scheduling(action_details, user_email)
-            elif action_type == 'restaurant_booking':
-                return self._confirm_restaurant_booking(action_details, user_email)
+            handler = self._confirm_dispatch.get(action_type)
+            if handler:
+                return handler(action_details, user_email)
             else:
                 return {
                     'success': False,
@@ -604,10 +780,10 @@ class Assistant:
                 }
                 
         except Exception as e:
-            self.logger.error(f"Error confirming action: {e}")
+            self.logger.error("Error confirming action: %s", e)
             return {
                 'success': False,
-                'message': format_error_message(f"Error confirming action: {str(e)}"),
+                'message': format_error_message(f"Error confirming action: {e}"),
                 'next_action': 'error'
             }
     
@@ -622,11 +798,7 @@ class Assistant:
             # Use selected time from UI if present
             selected_time = action_details.get('selected_time') or action_details.get('time')
             if not selected_time:
-                return {
-                    'success': False,
-                    'message': 'No time slot selected. Please select a time slot for the meeting.',
-                    'next_action': 'clarify'
-                }
+                return _NO_TIME_SELECTED.copy()
             # Prepare event details
             event_details = {
                 'title': action_details.get('title', 'Team Meeting'),
@@ -638,64 +810,103 @@ class Assistant:
                 'organizer': organizer_profile.get('email'),
                 'timezone': action_details.get('timezone', 'UTC'),
             }
-            # Final conflict check before event creation
-            from datetime import datetime, timedelta
-            from src.services.calendar_service import CalendarService
-            calendar_service = CalendarService()
+            # Final conflict check before event creation, unless this slot was offered moments ago
+            # (slot checks are only briefly cached and are invalidated when an event is created on that date)
             start_time = selected_time
-            try:
-                end_time = (datetime.strptime(start_time, '%H:%M') + timedelta(minutes=event_details['duration'])).strftime('%H:%M')
-            except Exception:
-                end_time = start_time  # fallback, should not happen
-            conflict_check = calendar_service.check_availability(
-                event_details['date'],
-                start_time,
-                end_time,
-                event_details['attendees']
-            )
-            if not conflict_check['available']:
-                return {
-                    'success': False,
-                    'message': 'The selected time slot is no longer available for all attendees. Please choose another slot.',
-                    'conflicts': conflict_check['conflicts'],
-                    'next_action': 'select_time_slot'
-                }
+            end_time = self._slot_end_time(start_time, event_details['duration'])
+            slot_date = self._convert_date_string_to_date(event_details['date'])
+            if not self._is_vetted_slot(slot_date, start_time, end_time, event_details['attendees']):
+                conflict_check = self.calendar_service.check_availability(
+                    event_details['date'],
+                    start_time,
+                    end_time,
+                    event_details['attendees']
+                )
+                if not conflict_check['available']:
+                    return dict(_SLOT_TAKEN, conflicts=conflict_check['conflicts'])
             # Create the calendar event
             event_created = self.calendar_service.create_event(event_details)
-            # Send meeting invite email to all attendees
-            email_sent = self.email_service.send_meeting_invite(event_details, event_details['attendees'], organizer_profile)
-            if event_created and email_sent:
-                return {
-                    'success': True,
-                    'message': 'Meeting scheduled, calendar event created, and notification email sent to all attendees.',
-                    'next_action': 'complete'
-                }
-            elif event_created:
-                return {
-                    'success': True,
-                    'message': 'Meeting scheduled and calendar event created, but failed to send notification email.',
-                    'next_action': 'complete'
-                }
-            elif email_sent:
-                return {
-                    'success': True,
-                    'message': 'Meeting notification email sent, but failed to create calendar event.',
-                    'next_action': 'complete'
-                }
-            else:
-                return {
-                    'success': False,
-                    'message': 'Failed to schedule meeting: could not create calendar event or send notification email.',
-                    'next_action': 'error'
-                }
+            if not event_created:
+                return _MEETING_EVENT_FAILED.copy()
+            # The new event may overlap any other slot offered for that day
+            self._forget_vetted_slots(slot_date)
+            # Invite attendees in the background, only once the event exists; the
+            # calendar event is the only thing on the path of the user's confirmation
+            self._queue_email(
+                f"meeting:{event_details['date']} {selected_time} {event_details['title']}",
+                self.email_service.send_meeting_invite, event_details, event_details['attendees'], organizer_profile
+            )
+            return _MEETING_CONFIRMED.copy()
         except Exception as e:
-            self.logger.error(f"Error confirming meeting scheduling: {e}")
+            self.logger.exception("Error confirming meeting scheduling: %s", e)
             return {
                 'success': False,
-                'message': format_error_message(f"Error confirming meeting: {str(e)}"),
+                'message': format_error_message(f"Error confirming meeting: {e}"),
                 'next_action': 'error'
             }
 
+    def _remember_vetted_slots(self, target_date: date, slots: List[Dict[str, Any]], attendees: List[str]):
+        """
+        Record slots that were just found free so confirming one needn't re-check it
+        
+        Args:
+            target_date: Date the slots are on
+            slots: Slots returned by find_available_slots
+            attendees: Emails the slots were checked against
+        """
+        now = time.monotonic()
+        self._vetted_slots = {
+            key: entry for key, entry in self._vetted_slots.items()
+            if now - entry[0] < VETTED_SLOT_TTL
+        }
+        checked = frozenset(email.lower() for email in attendees if email)
+        for slot in slots:
+            self._vetted_slots[(target_date, slot['start_time'], slot['end_time'])] = (now, checked)
+    
+    def _is_vetted_slot(self, slot_date: Optional[date], start_time: str, end_time: str, attendees: List[str]) -> bool:
+        """
+        Check whether a slot was offered recently for (at least) these attendees
+        
+        Args:
+            slot_date: Date of the slot
+            start_time: Slot start, "HH:MM"
+            end_time: Slot end, "HH:MM"
+            attendees: Emails the meeting is being booked for
+        
+        Returns:
+            True if the slot was vetted within VETTED_SLOT_TTL seconds
+        """
+        entry = self._vetted_slots.get((slot_date, start_time, end_time))
+        if entry is None or time.monotonic() - entry[0] >= VETTED_SLOT_TTL:
+            return False
+        return all(email.lower() in entry[1] for email in attendees if email)
+    
+    def _forget_vetted_slots(self, slot_date: Optional[date]):
+        """Drop every vetted slot on a date, e.g. after booking one of them"""
+        self._vetted_slots = {key: entry for key, entry in self._vetted_slots.items() if key[0] != slot_date}
+    
+    @staticmethod
+    def _slot_end_time(start_time: str, duration) -> str:
+        """
+        Add a duration to an "HH:MM" start time with integer arithmetic
+        
+        Args:
+            start_time: Start time, 24-hour "HH:MM"
+            duration: Duration in minutes
+        
+        Returns:
+            End time as "HH:MM" (wrapping past midnight), or start_time itself
+            if the time or duration isn't in the expected form
+        """
+        match = _HHMM_RE.fullmatch(start_time)
+        if not match or isinstance(duration, bool) or not isinstance(duration, (int, float)):
+            return start_time
+        hours, minutes = int(match.group(1)), int(match.group(2))
+        if hours > 23 or minutes > 59:
+            return start_time
+        end_minutes = (hours * 60 + minutes + int(duration)) % (24 * 60)
+        return f"{end_minutes // 60:02d}:{end_minutes % 60:02d}"
+    
     def _confirm_restaurant_booking(self, action_details: Dict[str, Any], user_email: str = None) -> Dict[str, Any]:
         """Confirm and execute restaurant booking"""
         try:
@@ -710,33 +921,27 @@ class Assistant:
             booking_time = self._convert_date_string_to_date(booking_time_str)
             
             if not booking_date:
-                return {
-                    'success': False,
-                    'message': "Could not parse the booking date. Please provide a valid date (e.g., '2023-10-27' or 'next Monday').",
-                    'next_action': 'clarify'
-                }
+                return _BOOKING_DATE_UNPARSEABLE.copy()
             
             if not booking_time:
-                return {
-                    'success': False,
-                    'message': "Could not parse the booking time. Please provide a valid time (e.g., '18:00' or '6 PM').",
-                    'next_action': 'clarify'
-                }
+                return _BOOKING_TIME_UNPARSEABLE.copy()
             
             # Always send dinner invites after booking
             attendee_emails = action_details.get('attendees', [])
-            invites_sent = False
             if attendee_emails:
-                invites_sent = self.email_service.send_dinner_invite(
+                # Invites go out in the background so the confirmation isn't held up by SMTP
+                self._queue_email(
+                    f"dinner:{booking_date_str} {booking_time_str} {restaurant_name}",
+                    self.email_service.send_dinner_invite,
                     action_details, attendee_emails, user_email or 'assistant@company.com'
                 )
-            if invites_sent:
                 return {
                     'success': True,
                     'message': format_success_message(
-                        f"Dinner booking confirmed at {restaurant_name}! Invites sent to {len(attendee_emails)} attendees."
+                        f"Dinner booking confirmed at {restaurant_name}! Invites are being sent to {len(attendee_emails)} attendees."
                     ),
-                    'next_action': 'complete'
+                    'next_action': 'complete',
+                    'email_status': 'queued'
                 }
             else:
                 return {
@@ -747,13 +952,24 @@ class Assistant:
                     'next_action': 'complete'
                 }
         except Exception as e:
-            self.logger.error(f"Error confirming restaurant booking: {e}")
+            self.logger.exception("Error confirming restaurant booking: %s", e)
             return {
                 'success': False,
-                'message': format_error_message(f"Error booking restaurant: {str(e)}"),
+                'message': format_error_message(f"Error booking restaurant: {e}"),
                 'next_action': 'error'
             }
     
+    def _queue_email(self, key: str, send, *args):
+        """
+        Send an email in the background; failures are reported by the sender pool
+        
+        Args:
+            key: What the email is for, e.g. 'meeting:2025-01-15 10:00 Standup'
+            send: EmailService send method returning True/False
+            *args: Arguments for send
+        """
+        send_in_background(send, *args, label=key)
+    
     def delete_event_and_notify(self, event_id: str, event_details: Dict[str, Any], user_email: str = None) -> Dict[str, Any]:
         """Delete an event and notify attendees"""
         try:
@@ -764,40 +980,30 @@ class Assistant:
                     'message': f"Failed to delete event with ID {event_id}.",
                     'next_action': 'error'
                 }
-            # Send cancellation email to attendees
+            # Send cancellation email to attendees in the background; the deletion is
+            # what the caller waits on
             attendee_emails = event_details.get('attendees', [])
             if attendee_emails:
-                subject = f"Meeting/Event Cancelled: {event_details.get('title', 'Event')} on {event_details.get('date', 'TBD')}"
-                content = f"""
-Dear Team,
-
-The following event has been cancelled:
-- Title: {event_details.get('title', 'Event')}
-- Date: {event_details.get('date', 'TBD')}
-- Time: {event_details.get('time', 'TBD')}
-- Location: {event_details.get('location', 'TBD')}
-
-We apologize for any inconvenience.
-
-Best regards,
-{user_email}
-"""
-                self.email_service.send_email(
-                    to_emails=attendee_emails,
-                    subject=subject,
-                    content=content,
-                    from_email=user_email or 'assistant@company.com'
+                title = event_details.get('title', 'Event')
+                event_date = event_details.get('date', 'TBD')
+                subject = f"Meeting/Event Cancelled: {title} on {event_date}"
+                content = _CANCELLATION_TMPL.format(
+                    title=title,
+                    date=event_date,
+                    time=event_details.get('time', 'TBD'),
+                    location=event_details.get('location', 'TBD'),
+                    sender=user_email
                 )
-            return {
-                'success': True,
-                'message': f"Event deleted and attendees notified.",
-                'next_action': 'complete'
-            }
+                self._queue_email(
+                    f"cancellation:{event_id}",
+                    self.email_service.send_email, attendee_emails, subject, content, user_email or 'assistant@company.com'
+                )
+            return _EVENT_DELETED.copy()
         except Exception as e:
-            self.logger.error(f"Error deleting event: {e}")
+            self.logger.exception("Error deleting event: %s", e)
             return {
                 'success': False,
-                'message': f"Error deleting event: {str(e)}",
+                'message': f"Error deleting event: {e}",
                 'next_action': 'error'
             }
     
@@ -806,19 +1012,35 @@ Best regards,
         try:
             deleted_count = 0
             failed = []
-            for email in user_emails:
-                # Get all events for this user on the date
-                events = self.calendar_service.get_events(target_date, target_date, user_email=email)
+            # Phase 1: get every user's events on the date with batched calendar requests
+            # (uncached, since these events are about to be deleted)
+            events_by_user = self.calendar_service.get_events_batched(
+                list(user_emails or []), target_date, target_date, use_cache=False
+            )
+            pending = []
+            seen_event_ids = set()
+            for email, events in events_by_user.items():
                 for event in events:
                     event_id = event.get('id')
                     if not event_id:
                         failed.append({'user': email, 'event': event, 'reason': 'No event ID'})
                         continue
-                    result = self.delete_event_and_notify(event_id, event, acting_user_email or email)
-                    if result.get('success'):
-                        deleted_count += 1
-                    else:
-                        failed.append({'user': email, 'event': event, 'reason': result.get('message')})
+                    # A shared meeting shows up on every attendee's calendar; delete it once
+                    if event_id in seen_event_ids:
+                        continue
+                    seen_event_ids.add(event_id)
+                    pending.append((email, event))
+            # Phase 2: delete and notify for every event at once; results keep the original order
+            with ThreadPoolExecutor(max_workers=max(1, min(16, len(pending)))) as executor:
+                results = list(executor.map(
+                    lambda job: self.delete_event_and_notify(job[1]['id'], job[1], acting_user_email or job[0]),
+                    pending
+                ))
+            for (email, event), result in zip(pending, results):
+                if result.get('success'):
+                    deleted_count += 1
+                else:
+                    failed.append({'user': email, 'event': event, 'reason': result.get('message')})
             return {
                 'success': True,
                 'message': f"Deleted {deleted_count} events. {len(failed)} failed.",
@@ -826,20 +1048,23 @@ Best regards,
                 'failed': failed
             }
         except Exception as e:
-            self.logger.error(f"Error cancelling events: {e}")
+            self.logger.exception("Error cancelling events: %s", e)
             return {
                 'success': False,
-                'message': f"Error cancelling events: {str(e)}",
+                'message': f"Error cancelling events: {e}",
                 'next_action': 'error'
             }
     
     def get_conversation_history(self) -> List[Dict[str, Any]]:
         """Get conversation history"""
-        return self.conversation_history
+        return [
+            {**entry, 'timestamp': entry['timestamp'].isoformat()}
+            for entry in self.conversation_history
+        ]
     
     def clear_conversation_history(self):
         """Clear conversation history"""
-        self.conversation_history = []
+        self.conversation_history.clear()
         self.logger.info("Conversation history cleared")
     
     def get_assistant_status(self) -> Dict[str, Any]:
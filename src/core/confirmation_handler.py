@@ -1,9 +1,42 @@
 """
 Confirmation Handler for managing user confirmations
 """
+import heapq
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 from src.utils.formatters import format_confirmation_message
 
+# Confirmations nobody answered are dropped after this long
+DEFAULT_MAX_AGE_HOURS = 24
+
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+@lru_cache(maxsize=4096)
+def _cached_confirmation_message(action_type: str, frozen_details: tuple) -> str:
+    # Lists were frozen to tuples; the formatter only joins them, so output is identical
+    return format_confirmation_message(action_type, dict(frozen_details))
+
+def _freeze_details(action_details: Dict[str, Any]) -> Optional[tuple]:
+    """
+    Hashable form of flat action details, or None if a value is not plain data
+    
+    Args:
+        action_details: Details of the action
+    
+    Returns:
+        Sorted tuple of (key, value) pairs with lists turned into tuples, or None
+    """
+    frozen = []
+    for key, value in action_details.items():
+        if isinstance(value, list) and all(isinstance(item, _SCALAR_TYPES) for item in value):
+            value = tuple(value)
+        elif not isinstance(value, _SCALAR_TYPES):
+            return None
+        frozen.append((key, value))
+    return tuple(sorted(frozen))
+
 class ConfirmationHandler:
     """
     Handler for managing user confirmations and approvals
@@ -12,6 +45,24 @@ class ConfirmationHandler:
     def __init__(self):
         self.pending_confirmations = {}
         self.confirmation_counter = 0
+        # Ids still awaiting a response, overall and per user (dicts keep creation order)
+        self._pending_ids = {}
+        self._pending_by_user = {}
+        # Answered confirmations awaiting clear_expired_confirmations
+        self._resolved_ids = {}
+        # Min-heap of (monotonic creation time, id) for age-based expiry
+        self._created_heap = []
+    
+    def _mark_resolved(self, confirmation_id: str):
+        """Drop a confirmation from the pending indexes"""
+        if self._pending_ids.pop(confirmation_id, None) is None:
+            return
+        user_email = self.pending_confirmations[confirmation_id].get('user_email')
+        user_pending = self._pending_by_user.get(user_email)
+        if user_pending is not None:
+            user_pending.pop(confirmation_id, None)
+            if not user_pending:
+                del self._pending_by_user[user_email]
     
     def create_confirmation(self, action_type: str, action_details: Dict[str, Any],
                           user_email: str = None) -> Dict[str, Any]:
@@ -35,10 +86,13 @@ class ConfirmationHandler:
             'action_details': action_details,
             'user_email': user_email,
             'status': 'pending',
-            'created_at': '2024-01-01T00:00:00Z'  # In real implementation, use datetime
+            'created_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
         }
         
         self.pending_confirmations[confirmation_id] = confirmation
+        self._pending_ids[confirmation_id] = True
+        self._pending_by_user.setdefault(user_email, {})[confirmation_id] = True
+        heapq.heappush(self._created_heap, (time.monotonic(), confirmation_id))
         
         return confirmation
     
@@ -55,7 +109,11 @@ class ConfirmationHandler:
         action_type = confirmation.get('action_type')
         action_details = confirmation.get('action_details', {})
         
-        return format_confirmation_message(action_type, action_details)
+        # UIs re-render the same confirmation on every poll; reuse the formatted text
+        frozen_details = _freeze_details(action_details)
+        if frozen_details is None:
+            return format_confirmation_message(action_type, action_details)
+        return _cached_confirmation_message(action_type, frozen_details)
     
     def process_confirmation(self, confirmation_id: str, user_response: str) -> Dict[str, Any]:
         """
@@ -80,6 +138,8 @@ class ConfirmationHandler:
         
         # Check if user confirmed
         if response_lower in ['yes', 'confirm', 'ok', 'proceed', 'sure']:
+            self._mark_resolved(confirmation_id)
+            self._resolved_ids[confirmation_id] = True
             confirmation['status'] = 'confirmed'
             confirmation['user_response'] = user_response
             
@@ -92,6 +152,8 @@ class ConfirmationHandler:
             }
         
         elif response_lower in ['no', 'cancel', 'abort', 'stop']:
+            self._mark_resolved(confirmation_id)
+            self._resolved_ids[confirmation_id] = True
             confirmation['status'] = 'cancelled'
             confirmation['user_response'] = user_response
             
@@ -118,14 +180,9 @@ class ConfirmationHandler:
         Returns:
             List of pending confirmations
         """
-        pending = []
-        
-        for confirmation in self.pending_confirmations.values():
-            if confirmation['status'] == 'pending':
-                if user_email is None or confirmation.get('user_email') == user_email:
-                    pending.append(confirmation)
-        
-        return pending
+        self._expire_stale(DEFAULT_MAX_AGE_HOURS * 3600)
+        pending_ids = self._pending_ids if user_email is None else self._pending_by_user.get(user_email, {})
+        return [self.pending_confirmations[confirmation_id] for confirmation_id in pending_ids]
     
     def clear_confirmation(self, confirmation_id: str) -> bool:
         """
@@ -138,13 +195,36 @@ class ConfirmationHandler:
             True if cleared successfully, False otherwise
         """
         if confirmation_id in self.pending_confirmations:
+            self._mark_resolved(confirmation_id)
+            self._resolved_ids.pop(confirmation_id, None)
             del self.pending_confirmations[confirmation_id]
             return True
         return False
     
-    def clear_expired_confirmations(self, max_age_hours: int = 24) -> int:
+    def _expire_stale(self, max_age_seconds: float) -> int:
+        """
+        Drop confirmations created more than max_age_seconds ago, oldest first
+        
+        Only the entries actually expiring are touched; heap items whose
+        confirmation was already cleared are skipped.
+        
+        Args:
+            max_age_seconds: Maximum age in seconds
+        
+        Returns:
+            Number of confirmations dropped
+        """
+        cutoff = time.monotonic() - max_age_seconds
+        expired = 0
+        while self._created_heap and self._created_heap[0][0] <= cutoff:
+            _, confirmation_id = heapq.heappop(self._created_heap)
+            if self.clear_confirmation(confirmation_id):
+                expired += 1
+        return expired
+    
+    def clear_expired_confirmations(self, max_age_hours: int = DEFAULT_MAX_AGE_HOURS) -> int:
         """
-        Clear expired confirmations
+        Clear answered confirmations and any older than max_age_hours
         
         Args:
             max_age_hours: Maximum age in hours
@@ -152,17 +232,13 @@ class ConfirmationHandler:
         Returns:
             Number of confirmations cleared
         """
-        # In a real implementation, you'd check actual timestamps
-        # For demo purposes, we'll just clear old confirmations
         cleared_count = 0
         
-        for confirmation_id in list(self.pending_confirmations.keys()):
-            confirmation = self.pending_confirmations[confirmation_id]
-            if confirmation['status'] in ['confirmed', 'cancelled']:
-                del self.pending_confirmations[confirmation_id]
+        for confirmation_id in list(self._resolved_ids):
+            if self.clear_confirmation(confirmation_id):
                 cleared_count += 1
         
-        return cleared_count
+        return cleared_count + self._expire_stale(max_age_hours * 3600)
     
     def get_confirmation_status(self, confirmation_id: str) -> Optional[str]:
         """
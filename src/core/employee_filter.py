@@ -47,19 +47,21 @@ class EmployeeFilter:
         Returns:
             Filtered list of employees
         """
+        if not all_employees:
+            return []
+        
         extracted_names = self.extract_employee_names(user_query)
         
         if not extracted_names:
             return all_employees  # Return all if no specific names mentioned
         
-        # Filter employees based on extracted names
+        # Filter employees based on extracted names; each distinct name is lowercased once
+        extracted_lower = list(dict.fromkeys(name.lower() for name in extracted_names))
         filtered_employees = []
         for employee in all_employees:
-            employee_name = employee.get('name', '').lower()
-            for extracted_name in extracted_names:
-                if extracted_name.lower() in employee_name or employee_name in extracted_name.lower():
-                    filtered_employees.append(employee)
-                    break
+            employee_name = (employee.get('name', '') or '').lower()
+            if any(name in employee_name or employee_name in name for name in extracted_lower):
+                filtered_employees.append(employee)
         
         return filtered_employees
     
@@ -92,24 +94,17 @@ class EmployeeFilter:
         Returns:
             List of employee details
         """
-        employee_details = []
-        
-        for name in names:
-            email = self.name_matcher.get_email_for_name(name)
-            if email:
-                employee_details.append({
-                    'name': name,
-                    'email': email,
-                    'available': True
-                })
-            else:
-                employee_details.append({
-                    'name': name,
-                    'email': None,
-                    'available': False
-                })
-        
-        return employee_details
+        # One bulk resolution, then zip names with their emails
+        emails = self.name_matcher.resolve_emails(names)
+        
+        return [
+            {
+                'name': name,
+                'email': email or None,
+                'available': bool(email)
+            }
+            for name, email in zip(names, emails)
+        ]
     
     def suggest_employee_names(self, partial_name: str) -> List[str]:
         """
@@ -121,13 +116,14 @@ class EmployeeFilter:
         Returns:
             List of suggested names
         """
-        team_members = self.name_matcher.get_team_members()
         suggestions = []
         
+        # Names are lowercased once per roster change; stop as soon as there are enough
         partial_lower = partial_name.lower()
-        for member in team_members:
-            name = member.get('name', '')
-            if partial_lower in name.lower():
+        for name_lower, name in self.name_matcher.team_names_lower:
+            if partial_lower in name_lower:
                 suggestions.append(name)
+                if len(suggestions) == 5:  # Limit to 5 suggestions
+                    break
         
-        return suggestions[:5]  # Limit to 5 suggestions 
\ No newline at end of file
+        return suggestions 
\ No newline at end of file
@@ -1,20 +1,377 @@
 """
 Goal Parser for understanding natural language queries
 """
+import os
 import re
+import copy
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
 from datetime import datetime, date, timedelta
 from src.utils.time_formatter import TimeFormatter
 from src.utils.name_matcher import NameMatcher
+from src.utils.logger import setup_logger
 import json
-from config.settings import USER_PROFILES_PATH
+from config.settings import USER_PROFILES_PATH, GOAL_PARSE_CACHE_SIZE
 
+# Optional: rapidfuzz has the same scorers as fuzzywuzzy in C++ (pip install rapidfuzz)
 try:
-    from fuzzywuzzy import fuzz, process
-    FUZZYWUZZY_AVAILABLE = True
+    from rapidfuzz import fuzz
+    from rapidfuzz.utils import default_process
+    RAPIDFUZZ_AVAILABLE = True
 except ImportError:
-    FUZZYWUZZY_AVAILABLE = False
-    print("Warning: fuzzywuzzy not available. Install with: pip install fuzzywuzzy python-Levenshtein")
+    RAPIDFUZZ_AVAILABLE = False
+
+if RAPIDFUZZ_AVAILABLE:
+    FUZZYWUZZY_AVAILABLE = True  # fuzzy matching is available, just via the faster drop-in
+else:
+    try:
+        from fuzzywuzzy import fuzz
+        FUZZYWUZZY_AVAILABLE = True
+    except ImportError:
+        FUZZYWUZZY_AVAILABLE = False
+        print("Warning: fuzzywuzzy not available. Install with: pip install fuzzywuzzy python-Levenshtein")
+
+# Optional: faster JSON decoding (pip install orjson)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional: Aho-Corasick automaton for one-pass keyword scans (pip install pyahocorasick)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Enhanced patterns for different types of requests, checked in this order
+_GOAL_PATTERNS = {
+    'meeting': [
+        r'setup\s+a\s+meeting',
+        r'schedule\s+a\s+meeting',
+        r'organize\s+a\s+meeting',
+        r'book\s+a\s+meeting',
+        r'arrange\s+a\s+meeting',
+        r'meeting\s+with',
+        r'meeting\s+for',
+        r'meeting',
+        r'call',
+        r'catch up',
+        r'1:1',
+        r'one on one',
+        r'let\'s\s+meet',
+        r'can we meet',
+        r'find time to meet',
+        r'set up a call',
+        r'set a meeting',
+        r'plan\s+a\s+meeting',
+        r'create\s+a\s+meeting',
+        r'arrange\s+a\s+call',
+    ],
+    'dinner': [
+        r'organize\s+a\s+dinner',
+        r'book\s+a\s+restaurant',
+        r'find\s+a\s+restaurant',
+        r'team\s+dinner',
+        r'celebratory\s+dinner',
+        r'dinner\s+for',
+        r'find\s+restaurants?',
+        r'look for restaurants?',
+        r'search for restaurants?',
+        r'find.*cuisine',
+        r'find.*food',
+        r'book\s+a\s+table',
+        r'reserve\s+a\s+table',
+        r'team\s+lunch',
+        r'lunch\s+for',
+        r'team\s+meal',
+        r'show me .*food',
+        r'show me .*restaurant',
+        r'show me .*places',
+        r'show .*food',
+        r'show .*restaurant',
+        r'show .*places',
+        r'restaurants?\s+with',
+        r'restaurants?\s+in',
+        r'restaurants?\s+near',
+        r'food\s+in',
+        r'eat\s+in',
+        r'dining\s+in',
+        r'places\s+to\s+eat',
+        r'good\s+restaurants?',
+        r'restaurant\s+recommendations?',
+        r'where\s+to\s+eat',
+        r'food\s+options',
+        r'biryani.*in',
+        r'.*biryani.*restaurant',
+        r'italian.*restaurant',
+        r'chinese.*restaurant',
+        r'indian.*restaurant',
+    ],
+    'availability': [
+        r'check\s+availability',
+        r'check\s+calendar',
+        r'when\s+is\s+.*\s+free',
+        r'find\s+free\s+time',
+        r'available\s+time',
+        r'when can we meet',
+        r'when is.*available',
+        r'find.*slot',
+        r'find.*availability',
+        r'check\s+schedule',
+        r'see\s+when.*free',
+        r'find\s+open\s+time',
+    ],
+    'email': [
+        r'send an email',
+        r'^email ',
+        r'^mail ',
+        r'greet',
+        r'greeting',
+        r'congratulate',
+        r'convey',
+        r'write to',
+        r'message ',
+        r'inform .* about',
+        r'tell .* about',
+        r'notify',
+        r'let .* know',
+        r'update .* about',
+        r'announce',
+        r'email .* about',
+        r'email .* regarding',
+        r'email .*',
+        r'mail .*',
+    ]
+}
+
+_REGEX_METACHARS = frozenset('\\.^$*+?{}[]|()')
+
+def _build_goal_matchers(goal_patterns: Dict[str, List[str]]) -> list:
+    """
+    Split each goal type's patterns into plain substrings, '^' anchored prefixes and a regex for the rest
+    
+    Args:
+        goal_patterns: Goal type -> patterns, in priority order
+    
+    Returns:
+        List of (goal_type, substrings, prefixes, regex or None) in the same order
+    """
+    matchers = []
+    for goal_type, patterns in goal_patterns.items():
+        substrings, prefixes, rest = [], [], []
+        for pattern in patterns:
+            if not _REGEX_METACHARS.intersection(pattern):
+                substrings.append(pattern)
+            elif pattern.startswith('^') and not _REGEX_METACHARS.intersection(pattern[1:]):
+                prefixes.append(pattern[1:])
+            else:
+                rest.append(pattern)
+        regex = re.compile('|'.join(f'(?:{pattern})' for pattern in rest)) if rest else None
+        matchers.append((goal_type, tuple(substrings), tuple(prefixes), regex))
+    return matchers
+
+# Per goal type, compiled once at import and shared by every GoalParser. Literal patterns are
+# tested with `in`/startswith and only the rest go through one alternation; the types stay
+# separate (rather than one regex with named groups) so their priority order holds.
+# parse_goal lowercases the query once, so this and the extractor patterns below skip IGNORECASE
+_GOAL_MATCHERS = _build_goal_matchers(_GOAL_PATTERNS)
+
+# Email subject / message extraction (matched against the lowercased query), in priority order.
+# Each pattern is keyed by the literal it starts with so absent triggers are skipped without a
+# regex search. "to ... about/regarding ..." and "send an email ..." were dropped: whenever they
+# matched, the plain about/regarding and email patterns ahead of them had already matched
+_SUBJECT_PATTERNS = [(literal, re.compile(pattern)) for literal, pattern in (
+    ('about', r'about ([^\.]+)'),
+    ('regarding', r'regarding ([^\.]+)'),
+)]
+_MESSAGE_PATTERNS = [(literal, re.compile(pattern)) for literal, pattern in (
+    ('greet', r'greet(?:ing)?(?: them| [^ ]+)?(?: and [^ ]+)?(?:,? )?(.*)'),
+    ('inform', r'inform(?: them| [^ ]+)?(?: and [^ ]+)?(?:,? )?(.*)'),
+    ('tell', r'tell(?: them| [^ ]+)?(?: and [^ ]+)?(?:,? )?(.*)'),
+    ('convey', r'convey(?: to [^ ]+)?(?:,? )?(.*)'),
+    ('email', r'email(?: to [^ ]+)?(?:,? )?(.*)'),
+)]
+
+# Enhanced meeting title patterns
+_TITLE_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'meeting\s+(?:about|for|on|regarding)\s+([^,\.]+)',
+    r'(?:setup|schedule|organize|plan|create)\s+a\s+meeting\s+(?:about|for|on|regarding)\s+([^,\.]+)',
+    r'meeting\s+with\s+.*?\s+(?:about|for|on|regarding)\s+([^,\.]+)',
+    r'call\s+(?:about|for|on|regarding)\s+([^,\.]+)',
+    r'(?:setup|schedule|organize)\s+a\s+call\s+(?:about|for|on|regarding)\s+([^,\.]+)',
+    r'1:1\s+(?:about|for|on|regarding)\s+([^,\.]+)',
+    r'one\s+on\s+one\s+(?:about|for|on|regarding)\s+([^,\.]+)',
+)]
+
+# Words dropped from extracted meeting titles
+_TITLE_STOP_WORDS = frozenset(('the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'))
+
+# Expanded date patterns fused into one alternation (one capture group per form) so a query is
+# scanned once; ISO first as the most common machine-generated form. Month names are matched as
+# any word and confirmed against _MONTH_PREFIXES instead of spelling out every month per form
+_DATE_REGEX = re.compile('|'.join((
+    r'(\d{4}-\d{2}-\d{2})',
+    r'(\d{1,2}/\d{1,2}/\d{4})',
+    r'(\d{1,2}-\d{1,2}-\d{4})',
+    r'(\d{1,2}\s+[a-z]+,?\s+\d{4})',
+    r'\b([a-z]+\s+\d{1,2},?\s+\d{4})',
+)))
+_DAY_MONTH_GROUP = 4
+_MONTH_DAY_GROUP = 5
+_MONTH_PREFIXES = frozenset(('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'))
+
+# Relative date phrases in priority order; matched on word tokens and bigrams rather than
+# one regex search per phrase
+_RELATIVE_DATE_KEYWORDS = ('today', 'tomorrow', 'next week', 'next monday', 'next friday', 'this week', 'next month')
+_RELATIVE_DATE_TOKENS = frozenset(k for k in _RELATIVE_DATE_KEYWORDS if ' ' not in k)
+_RELATIVE_DATE_BIGRAMS = frozenset(tuple(k.split()) for k in _RELATIVE_DATE_KEYWORDS if ' ' in k)
+_WORD_RE = re.compile(r'[a-z]+')
+
+# Enhanced time patterns
+_TIME_PATTERNS = [re.compile(pattern) for pattern in (
+    r'(\d{1,2}:\d{2}\s*(?:am|pm)?)',
+    r'(\d{1,2}\s*(?:am|pm))',
+    r'at\s+(\d{1,2}:\d{2})',
+    r'at\s+(\d{1,2}\s*(?:am|pm))',
+    r'(\d{1,2}:\d{2})',
+    r'(\d{1,2}\s*(?:am|pm))',
+    r'(\d{1,2}:\d{2}\s*(?:am|pm))',
+    r'(\d{1,2}\s*(?:am|pm))',
+    r'(\d{1,2}:\d{2}\s*(?:a\.m\.|p\.m\.))',
+    r'(\d{1,2}\s*(?:a\.m\.|p\.m\.))',
+)]
+
+# Every time, duration and team-size pattern needs a digit; one search for one lets queries without
+# any skip those pattern lists entirely
+_DIGIT_RE = re.compile(r'\d')
+
+# Time normalization: 12-hour clock with optional minutes/am-pm, and already-24-hour values
+_TIME_AMPM_RE = re.compile(r'^(\d{1,2})(?::(\d{2}))?\s*(am|pm)?$')
+_TIME_24H_RE = re.compile(r'^(\d{2}):(\d{2})$')
+_NOON_WORDS = frozenset(('noon', '12noon', '12:00noon'))
+_MIDNIGHT_WORDS = frozenset(('midnight', '12midnight', '12:00midnight'))
+
+# A number and its unit in one scan; an hour count may carry trailing minutes ("1 hour 30 min")
+_DURATION_REGEX = re.compile(
+    r'(?P<value>\d+)\s*(?P<unit>hour|hr|minute|min)s?'
+    r'(?:\s*(?P<minutes>\d+)\s*(?:minute|min)s?)?'
+)
+
+_LOCATION_PATTERNS = [re.compile(pattern) for pattern in (
+    r'in\s+([^,]+)',
+    r'at\s+([^,]+)',
+    r'near\s+([^,]+)',
+    r'around\s+([^,]+)',
+    r'location[:\s]+([^,]+)',
+    r'venue[:\s]+([^,]+)'
+)]
+# Time expressions that must not be taken for a location, fused so a candidate is checked in one search
+_TIME_EXPRESSION_REGEX = re.compile(
+    r'\b\d{1,2}:\d{2}(?:\s*(?:am|pm))?\b'
+    r'|\b\d{1,2}\s*(?:am|pm)\b'
+    r'|\b(?:noon|midnight|morning|evening|afternoon|night)\b'
+)
+
+# Team size in one scan: "<n> person team/people/attendees/members" or "team of <n>"
+_TEAM_SIZE_REGEX = re.compile(
+    r'(\d+)\s*(?:person\s*team|people|attendees|members)'
+    r'|team\s+of\s+(\d+)'
+)
+
+@lru_cache(maxsize=1)
+def _load_admin_names(path: str, mtime: float) -> tuple:
+    """
+    Load admin names from user_profiles.json, shared by every GoalParser
+    
+    Args:
+        path: Path to user_profiles.json
+        mtime: File modification time; part of the cache key so edits are picked up
+    
+    Returns:
+        Tuple of admin display names
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    profiles = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+    users = profiles.get('users', {})
+    return tuple(user.get('name') for user in users.values() if user.get('is_admin', False))
+
+def _build_keyword_scanner(keyword_values: Dict[str, Any]):
+    """
+    Build a single-pass scanner for a set of literal keywords
+    
+    Args:
+        keyword_values: Keyword -> value reported when it occurs
+    
+    Returns:
+        Function mapping a text to the values of every keyword occurring in it
+    """
+    if AHOCORASICK_AVAILABLE:
+        automaton = ahocorasick.Automaton()
+        for keyword, value in keyword_values.items():
+            automaton.add_word(keyword, value)
+        automaton.make_automaton()
+        return lambda text: [value for _, value in automaton.iter(text)]
+    # Zero-width lookahead so overlapping keywords are all reported, still in one regex pass
+    regex = re.compile('(?=(' + '|'.join(
+        re.escape(keyword) for keyword in sorted(keyword_values, key=len, reverse=True)
+    ) + '))')
+    return lambda text: [keyword_values[match.group(1)] for match in regex.finditer(text)]
+
+# Cuisine keywords; when several cuisines are mentioned the one listed first wins
+_CUISINE_KEYWORDS = {
+    'indian': ['indian', 'curry', 'biryani', 'tandoori'],
+    'chinese': ['chinese', 'szechuan', 'cantonese'],
+    'italian': ['italian', 'pizza', 'pasta'],
+    'mexican': ['mexican', 'taco', 'burrito'],
+    'japanese': ['japanese', 'sushi', 'ramen'],
+    'thai': ['thai', 'pad thai'],
+    'mediterranean': ['mediterranean', 'greek', 'lebanese'],
+    'american': ['american', 'burger', 'steak'],
+    'hyderabadi': ['hyderabadi', 'biryani', 'haleem']
+}
+_CUISINE_BY_KEYWORD = {}
+for _rank, (_cuisine, _keywords) in enumerate(_CUISINE_KEYWORDS.items()):
+    for _keyword in _keywords:
+        # A keyword listed under two cuisines (biryani) belongs to the first
+        _CUISINE_BY_KEYWORD.setdefault(_keyword, (_rank, _cuisine.title()))
+_scan_cuisines = _build_keyword_scanner(_CUISINE_BY_KEYWORD)
+
+# Candidates for fuzzy matching
+_COMMON_MEETING_TYPES = (
+    'project planning', 'status update', 'review', 'discussion',
+    'brainstorming', 'planning', 'sync', 'catch up', 'check-in',
+    'weekly review', 'monthly review', 'quarterly review',
+    'team meeting', 'client meeting', 'stakeholder meeting'
+)
+_TIME_KEYWORDS = ('morning', 'afternoon', 'evening', 'night', 'noon', 'midnight')
+
+@lru_cache(maxsize=2048)
+def _token_sort_ratio(text: str, candidate: str) -> int:
+    """fuzz.token_sort_ratio memoized per (text, candidate) pair; query words repeat a lot"""
+    if RAPIDFUZZ_AVAILABLE:
+        # rapidfuzz neither preprocesses nor rounds by default; match fuzzywuzzy's integer scores
+        return round(fuzz.token_sort_ratio(text, candidate, processor=default_process))
+    return fuzz.token_sort_ratio(text, candidate)
+
+@lru_cache(maxsize=32)
+def _relative_date_iso(time_formatter: TimeFormatter, today_ordinal: int, relative_date: str) -> Optional[str]:
+    """time_formatter.get_relative_date as an ISO string, memoized per day (the ordinal rolls over at midnight)"""
+    parsed_date = time_formatter.get_relative_date(relative_date)
+    return parsed_date.strftime("%Y-%m-%d") if parsed_date else None
+
+_FUZZY_TIME_MAPPINGS = {
+    'morning': '09:00',
+    'afternoon': '14:00',
+    'evening': '18:00',
+    'night': '20:00',
+    'noon': '12:00',
+    'midnight': '00:00'
+}
 
 class GoalParser:
     """
@@ -22,120 +379,36 @@ class GoalParser:
     """
     
     def __init__(self):
+        # Per-query tracing goes to logger.debug with %-style args, so it costs nothing above DEBUG
+        self.logger = setup_logger("goal_parser")
         self.time_formatter = TimeFormatter()
         self.name_matcher = NameMatcher()
         # self.admin_email = None
-        # Load admin names from user_profiles.json
+        # Load admin names from user_profiles.json (read once per file version, not per parser)
         self.admin_names = []
         try:
-            with open(USER_PROFILES_PATH, 'r', encoding='utf-8') as f:
-                profiles = json.load(f)
-                users = profiles.get('users', {})
-                for user in users.values():
-                    if user.get('is_admin', False):
-                        self.admin_names.append(user.get('name'))
+            self.admin_names = list(_load_admin_names(str(USER_PROFILES_PATH), os.path.getmtime(USER_PROFILES_PATH)))
         except Exception as e:
-            print(f"[GoalParser] Could not load admin names from user_profiles.json: {e}")
+            self.logger.warning("Could not load admin names from user_profiles.json: %s", e)
         
         # Enhanced patterns for different types of requests
-        self.patterns = {
-            'meeting': [
-                r'setup\s+a\s+meeting',
-                r'schedule\s+a\s+meeting',
-                r'organize\s+a\s+meeting',
-                r'book\s+a\s+meeting',
-                r'arrange\s+a\s+meeting',
-                r'meeting\s+with',
-                r'meeting\s+for',
-                r'meeting',
-                r'call',
-                r'catch up',
-                r'1:1',
-                r'one on one',
-                r'let\'s\s+meet',
-                r'can we meet',
-                r'find time to meet',
-                r'set up a call',
-                r'set a meeting',
-                r'plan\s+a\s+meeting',
-                r'create\s+a\s+meeting',
-                r'arrange\s+a\s+call',
-            ],
-            'dinner': [
-                r'organize\s+a\s+dinner',
-                r'book\s+a\s+restaurant',
-                r'find\s+a\s+restaurant',
-                r'team\s+dinner',
-                r'celebratory\s+dinner',
-                r'dinner\s+for',
-                r'find\s+restaurants?',
-                r'look for restaurants?',
-                r'search for restaurants?',
-                r'find.*cuisine',
-                r'find.*food',
-                r'book\s+a\s+table',
-                r'reserve\s+a\s+table',
-                r'team\s+lunch',
-                r'lunch\s+for',
-                r'team\s+meal',
-                r'show me .*food',
-                r'show me .*restaurant',
-                r'show me .*places',
-                r'show .*food',
-                r'show .*restaurant',
-                r'show .*places',
-                r'restaurants?\s+with',
-                r'restaurants?\s+in',
-                r'restaurants?\s+near',
-                r'food\s+in',
-                r'eat\s+in',
-                r'dining\s+in',
-                r'places\s+to\s+eat',
-                r'good\s+restaurants?',
-                r'restaurant\s+recommendations?',
-                r'where\s+to\s+eat',
-                r'food\s+options',
-                r'biryani.*in',
-                r'.*biryani.*restaurant',
-                r'italian.*restaurant',
-                r'chinese.*restaurant',
-                r'indian.*restaurant',
-            ],
-            'availability': [
-                r'check\s+availability',
-                r'check\s+calendar',
-                r'when\s+is\s+.*\s+free',
-                r'find\s+free\s+time',
-                r'available\s+time',
-                r'when can we meet',
-                r'when is.*available',
-                r'find.*slot',
-                r'find.*availability',
-                r'check\s+schedule',
-                r'see\s+when.*free',
-                r'find\s+open\s+time',
-            ],
-            'email': [
-                r'send an email',
-                r'^email ',
-                r'^mail ',
-                r'greet',
-                r'greeting',
-                r'congratulate',
-                r'convey',
-                r'write to',
-                r'message ',
-                r'inform .* about',
-                r'tell .* about',
-                r'notify',
-                r'let .* know',
-                r'update .* about',
-                r'announce',
-                r'email .* about',
-                r'email .* regarding',
-                r'email .*',
-                r'mail .*',
-            ]
+        self.patterns = _GOAL_PATTERNS
+        
+        # Parsed goals keyed by (query, day, roster version): relative dates and team changes
+        # make an old entry unreachable instead of serving it stale
+        self._parse_cache = OrderedDict()
+        self._parse_cache_lock = threading.Lock()
+        self.cache_stats = {'hits': 0, 'misses': 0}
+        
+        # (roster version, [(name, lowercased name, token set)]) for _clean_employee_names
+        self._team_name_index = (None, [])
+        
+        # Goal type -> detail parser, bound once so each query costs one dict lookup
+        self._goal_dispatch = {
+            'meeting': self._parse_meeting_goal,
+            'dinner': self._parse_dinner_goal,
+            'availability': self._parse_availability_goal,
+            'email': self._parse_email_goal
         }
     
     def parse_goal(self, user_query: str) -> Optional[Dict[str, Any]]:
@@ -148,40 +421,55 @@ class GoalParser:
         Returns:
             Dictionary with parsed goal information or None
         """
+        cache_key = (user_query, date.today(), self.name_matcher.roster_version)
+        with self._parse_cache_lock:
+            cached = self._parse_cache.get(cache_key)
+            if cached is not None:
+                self._parse_cache.move_to_end(cache_key)
+            self.cache_stats['hits' if cached is not None else 'misses'] += 1
+        if cached is not None:
+            # Callers may mutate the result, so neither side shares it with the cache
+            return copy.deepcopy(cached)
+        
+        details = self._parse_goal_uncached(user_query)
+        if details is not None:
+            with self._parse_cache_lock:
+                self._parse_cache[cache_key] = copy.deepcopy(details)
+                if len(self._parse_cache) > GOAL_PARSE_CACHE_SIZE:
+                    self._parse_cache.popitem(last=False)
+        return details
+    
+    def _parse_goal_uncached(self, user_query: str) -> Optional[Dict[str, Any]]:
+        """Parse a query that isn't in the parse cache"""
         try:
             query_lower = user_query.lower().strip()
             # Debug: print the incoming query
-            print(f"[GoalParser] Parsing query: {user_query}")
+            self.logger.debug("Parsing query: %s", user_query)
             # Determine goal type
             goal_type = self._determine_goal_type(query_lower)
-            print(f"[GoalParser] Detected goal type: {goal_type}")
+            self.logger.debug("Detected goal type: %s", goal_type)
             if not goal_type:
-                print(f"[GoalParser] No goal type matched for: {user_query}")
+                self.logger.debug("No goal type matched for: %s", user_query)
                 return None
             # Extract details based on goal type
-            if goal_type == 'meeting':
-                details = self._parse_meeting_goal(user_query, query_lower)
-            elif goal_type == 'dinner':
-                details = self._parse_dinner_goal(user_query, query_lower)
-            elif goal_type == 'availability':
-                details = self._parse_availability_goal(user_query, query_lower)
-            elif goal_type == 'email':
-                details = self._parse_email_goal(user_query, query_lower)
-            else:
-                print(f"[GoalParser] Unknown goal type: {goal_type}")
+            handler = self._goal_dispatch.get(goal_type)
+            if not handler:
+                self.logger.warning("Unknown goal type: %s", goal_type)
                 return None
-            print(f"[GoalParser] Extracted details: {details}")
+            details = handler(user_query, query_lower)
+            self.logger.debug("Extracted details: %s", details)
             return details
         except Exception as e:
-            print(f"Error parsing goal: {e}")
+            self.logger.error("Error parsing goal: %s", e)
             return None
     
     def _determine_goal_type(self, query: str) -> Optional[str]:
         """Determine the type of goal from the query"""
-        for goal_type, patterns in self.patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, query, re.IGNORECASE):
-                    return goal_type
+        for goal_type, substrings, prefixes, regex in _GOAL_MATCHERS:
+            if (any(substring in query for substring in substrings)
+                    or query.startswith(prefixes)
+                    or (regex and regex.search(query))):
+                return goal_type
         return None
     
     def _parse_meeting_goal(self, original_query: str, query_lower: str) -> Dict[str, Any]:
@@ -223,7 +511,7 @@ class GoalParser:
         employees = self._clean_employee_names(self.name_matcher.extract_employee_names(original_query))
         location = self._extract_location(query_lower)
         cuisine = self._extract_cuisine(query_lower)
-        print(f"[GoalParser] Dinner goal - extracted location: {location}, cuisine: {cuisine}")
+        self.logger.debug("Dinner goal - extracted location: %s, cuisine: %s", location, cuisine)
         details = {
             'type': 'dinner',
             'location': location,
@@ -262,7 +550,7 @@ class GoalParser:
         unmapped = []  # Always initialize
         # Handle special flag for missing recipients
         if raw_names and raw_names[0] == "__ASK_USER_FOR_EMPLOYEE__":
-            print("[GoalParser] No recipient found. Prompting user.")
+            self.logger.debug("No recipient found. Prompting user.")
             return {
                 'type': 'email',
                 'warnings': ['No recipient found. Please specify who to email.'],
@@ -270,37 +558,33 @@ class GoalParser:
                 'message': original_query
             }
         # If 'everyone' or similar, get all team emails
-        if raw_names and set(raw_names) == set([member['name'] for member in self.name_matcher.get_team_members()]):
-            recipients = [member['email'] for member in self.name_matcher.get_team_members()]
+        if self.name_matcher.is_whole_team(raw_names):
+            recipients = list(self.name_matcher.team_email_list)
         else:
             # Map both names and emails to user emails
             recipients = []
             for r in raw_names:
-                if '@' in r and self.name_matcher.get_email_for_name(r) is None:
+                email = self.name_matcher.get_email_for_name(r)
+                if email:
+                    recipients.append(email)
+                elif '@' in r:
                     from src.utils.validators import validate_email
                     if validate_email(r):
                         recipients.append(r)
                     else:
                         unmapped.append(r)
                 else:
-                    email = self.name_matcher.get_email_for_name(r)
-                    if email:
-                        recipients.append(email)
-                    else:
-                        unmapped.append(r)
-        print(f"[GoalParser] Resolved recipients: {recipients}, unmapped: {unmapped}")
+                    unmapped.append(r)
+        self.logger.debug("Resolved recipients: %s, unmapped: %s", recipients, unmapped)
         warnings = getattr(self, 'last_employee_warnings', [])
         if unmapped:
             warnings.append(f"Unrecognized recipients: {', '.join(unmapped)}")
         # Try to extract a subject (look for 'about ...', 'regarding ...', etc.)
         subject = None
-        subject_patterns = [
-            r'about ([^\.]+)',
-            r'regarding ([^\.]+)',
-            r'to (.+?) (?:about|regarding) ([^\.]+)',
-        ]
-        for pattern in subject_patterns:
-            match = re.search(pattern, query_lower)
+        for literal, pattern in _SUBJECT_PATTERNS:
+            if literal not in query_lower:
+                continue
+            match = pattern.search(query_lower)
             if match:
                 subject = match.group(1).strip()
                 break
@@ -311,16 +595,10 @@ class GoalParser:
             message = original_query.split(':', 1)[1].strip()
         else:
             # Fallback to previous patterns
-            message_patterns = [
-                r'greet(?:ing)?(?: them| [^ ]+)?(?: and [^ ]+)?(?:,? )?(.*)',
-                r'inform(?: them| [^ ]+)?(?: and [^ ]+)?(?:,? )?(.*)',
-                r'tell(?: them| [^ ]+)?(?: and [^ ]+)?(?:,? )?(.*)',
-                r'convey(?: to [^ ]+)?(?:,? )?(.*)',
-                r'email(?: to [^ ]+)?(?:,? )?(.*)',
-                r'send an email(?: to [^ ]+)?(?:,? )?(.*)',
-            ]
-            for pattern in message_patterns:
-                match = re.search(pattern, query_lower)
+            for literal, pattern in _MESSAGE_PATTERNS:
+                if literal not in query_lower:
+                    continue
+                match = pattern.search(query_lower)
                 if match and match.group(1).strip():
                     message = match.group(1).strip()
                     break
@@ -340,19 +618,8 @@ class GoalParser:
     
     def _extract_meeting_title(self, query: str) -> Optional[str]:
         """Extract meeting title from query using enhanced patterns and fuzzy matching"""
-        # Enhanced meeting title patterns
-        patterns = [
-            r'meeting\s+(?:about|for|on|regarding)\s+([^,\.]+)',
-            r'(?:setup|schedule|organize|plan|create)\s+a\s+meeting\s+(?:about|for|on|regarding)\s+([^,\.]+)',
-            r'meeting\s+with\s+.*?\s+(?:about|for|on|regarding)\s+([^,\.]+)',
-            r'call\s+(?:about|for|on|regarding)\s+([^,\.]+)',
-            r'(?:setup|schedule|organize)\s+a\s+call\s+(?:about|for|on|regarding)\s+([^,\.]+)',
-            r'1:1\s+(?:about|for|on|regarding)\s+([^,\.]+)',
-            r'one\s+on\s+one\s+(?:about|for|on|regarding)\s+([^,\.]+)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, query, re.IGNORECASE)
+        for pattern in _TITLE_PATTERNS:
+            match = pattern.search(query)
             if match:
                 title = match.group(1).strip()
                 if len(title) > 3:  # Avoid very short titles
@@ -362,127 +629,82 @@ class GoalParser:
         
         # Try fuzzy matching for common meeting types
         if FUZZYWUZZY_AVAILABLE:
-            common_meeting_types = [
-                'project planning', 'status update', 'review', 'discussion',
-                'brainstorming', 'planning', 'sync', 'catch up', 'check-in',
-                'weekly review', 'monthly review', 'quarterly review',
-                'team meeting', 'client meeting', 'stakeholder meeting'
-            ]
-            
             query_lower = query.lower()
-            best_match = self._fuzzy_match_text(query_lower, common_meeting_types, threshold=70)
+            best_match = self._fuzzy_match_text(query_lower, _COMMON_MEETING_TYPES, threshold=70)
             if best_match:
                 return best_match.title()
         
         return "Team Meeting"  # Default title
     
-    def _clean_meeting_title(self, title: str) -> str:
+    @staticmethod
+    def _clean_meeting_title(title: str) -> str:
         """Clean and normalize meeting title"""
         # Remove common stop words and clean up
-        stop_words = ['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by']
-        
         words = title.split()
-        cleaned_words = [word for word in words if word.lower() not in stop_words]
+        cleaned_words = [word for word in words if word.lower() not in _TITLE_STOP_WORDS]
         
         if cleaned_words:
             return ' '.join(cleaned_words).title()
         
         return title.title()
     
-    def _extract_date(self, query: str) -> Optional[str]:
-        """Extract date from query"""
-        # Expanded date patterns
-        date_patterns = [
-            r'(\d{1,2}/\d{1,2}/\d{4})',
-            r'(\d{4}-\d{2}-\d{2})',
-            r'(\d{1,2}-\d{1,2}-\d{4})',
-            r'(\d{1,2}\s+(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{4})',
-            r'(\d{1,2}\s+(?:january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{4})',
-            r'((?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{1,2},?\s+\d{4})',
-            r'((?:january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2},?\s+\d{4})',
-            r'(\d{1,2}\s+(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*,?\s+\d{4})',
-            r'(\d{1,2}\s+(?:january|february|march|april|may|june|july|august|september|october|november|december),?\s+\d{4})',
-            r'(\d{1,2}\s+(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{4})',
-            r'(\d{1,2}\s+(?:january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{4})',
-            r'((?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{1,2}\s+\d{4})',
-            r'((?:january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2}\s+\d{4})'
-        ]
-        for pattern in date_patterns:
-            match = re.search(pattern, query, re.IGNORECASE)
-            if match:
-                print(f"[GoalParser] Date matched: {match.group(1)}")
-                return match.group(1)
+    def _extract_date(self, query_lower: str) -> Optional[str]:
+        """Extract date from the lowercased query"""
+        match = _DATE_REGEX.search(query_lower)
+        while match:
+            group = match.lastindex
+            date_str = match.group(group)
+            if group == _DAY_MONTH_GROUP or group == _MONTH_DAY_GROUP:
+                month = date_str.split()[1 if group == _DAY_MONTH_GROUP else 0]
+                if month[:3] not in _MONTH_PREFIXES:
+                    match = _DATE_REGEX.search(query_lower, match.start() + 1)
+                    continue
+            self.logger.debug("Date matched: %s", date_str)
+            return date_str
         # Look for relative dates
-        relative_patterns = [
-            r'(today)',
-            r'(tomorrow)',
-            r'(next\s+week)',
-            r'(next\s+monday)',
-            r'(next\s+friday)',
-            r'(this\s+week)',
-            r'(next\s+month)'
-        ]
-        for pattern in relative_patterns:
-            match = re.search(pattern, query, re.IGNORECASE)
-            if match:
-                relative_date = match.group(1).lower()
-                parsed_date = self.time_formatter.get_relative_date(relative_date)
-                if parsed_date:
-                    print(f"[GoalParser] Relative date matched: {relative_date} -> {parsed_date}")
-                    return parsed_date.strftime("%Y-%m-%d")
-        print(f"[GoalParser] No date matched in: {query}")
+        words = _WORD_RE.findall(query_lower)
+        found = {word for word in words if word in _RELATIVE_DATE_TOKENS}
+        found.update(' '.join(pair) for pair in zip(words, words[1:]) if pair in _RELATIVE_DATE_BIGRAMS)
+        for relative_date in _RELATIVE_DATE_KEYWORDS:
+            if relative_date in found:
+                iso_date = _relative_date_iso(self.time_formatter, date.today().toordinal(), relative_date)
+                if iso_date:
+                    self.logger.debug("Relative date matched: %s -> %s", relative_date, iso_date)
+                    return iso_date
+        self.logger.debug("No date matched in: %s", query_lower)
         return None
     
-    def _extract_time(self, query: str) -> Optional[str]:
-        """Extract time from query using enhanced patterns and fuzzy matching"""
-        # Enhanced time patterns
-        time_patterns = [
-            r'(\d{1,2}:\d{2}\s*(?:am|pm)?)',
-            r'(\d{1,2}\s*(?:am|pm))',
-            r'at\s+(\d{1,2}:\d{2})',
-            r'at\s+(\d{1,2}\s*(?:am|pm))',
-            r'(\d{1,2}:\d{2})',
-            r'(\d{1,2}\s*(?:am|pm))',
-            r'(\d{1,2}:\d{2}\s*(?:am|pm))',
-            r'(\d{1,2}\s*(?:am|pm))',
-            r'(\d{1,2}:\d{2}\s*(?:a\.m\.|p\.m\.))',
-            r'(\d{1,2}\s*(?:a\.m\.|p\.m\.))',
-        ]
-        
-        for pattern in time_patterns:
-            match = re.search(pattern, query, re.IGNORECASE)
-            if match:
-                time_str = match.group(1).strip()
-                # Normalize time format
-                time_str = self._normalize_time_format(time_str)
-                return time_str
+    def _extract_time(self, query_lower: str) -> Optional[str]:
+        """Extract time from the lowercased query using enhanced patterns and fuzzy matching"""
+        if _DIGIT_RE.search(query_lower):
+            for pattern in _TIME_PATTERNS:
+                match = pattern.search(query_lower)
+                if match:
+                    time_str = match.group(1).strip()
+                    # Normalize time format
+                    time_str = self._normalize_time_format(time_str)
+                    return time_str
         
         # Try fuzzy matching for time-related words
         if FUZZYWUZZY_AVAILABLE:
-            time_keywords = ['morning', 'afternoon', 'evening', 'night', 'noon', 'midnight']
-            query_words = query.lower().split()
+            query_words = query_lower.split()
             
             for word in query_words:
-                matches = process.extractBests(
-                    word, 
-                    time_keywords, 
-                    scorer=fuzz.token_sort_ratio,
-                    score_cutoff=80
-                )
-                if matches:
+                match = self._fuzzy_match_text(word, _TIME_KEYWORDS, threshold=80)
+                if match:
                     # Convert fuzzy time to specific time
-                    fuzzy_time = self._convert_fuzzy_time_to_specific(matches[0][0])
+                    fuzzy_time = self._convert_fuzzy_time_to_specific(match)
                     if fuzzy_time:
                         return fuzzy_time
         
         return None
     
-    def _normalize_time_format(self, time_str: str) -> str:
+    @staticmethod
+    def _normalize_time_format(time_str: str) -> str:
         """Normalize time string to 24-hour format (e.g., 12:00, 17:00)"""
-        import re
         time_str = time_str.lower().strip()
         # Handle am/pm
-        match = re.match(r'^(\d{1,2})(?::(\d{2}))?\s*(am|pm)?$', time_str)
+        match = _TIME_AMPM_RE.match(time_str)
         if match:
             hour = int(match.group(1))
             minute = int(match.group(2)) if match.group(2) else 0
@@ -493,30 +715,19 @@ class GoalParser:
                 hour = 0
             return f"{hour:02d}:{minute:02d}"
         # Already in 24-hour format
-        match = re.match(r'^(\d{2}):(\d{2})$', time_str)
+        match = _TIME_24H_RE.match(time_str)
         if match:
             return time_str
         # Fallback: noon, midnight
-        if time_str in ['noon', '12noon', '12:00noon']:
+        if time_str in _NOON_WORDS:
             return '12:00'
-        if time_str in ['midnight', '12midnight', '12:00midnight']:
+        if time_str in _MIDNIGHT_WORDS:
             return '00:00'
         return time_str
     
     def _convert_fuzzy_time_to_specific(self, fuzzy_time: str) -> Optional[str]:
         """Convert fuzzy time descriptions to specific times"""
-        fuzzy_time = fuzzy_time.lower()
-        
-        time_mappings = {
-            'morning': '09:00',
-            'afternoon': '14:00',
-            'evening': '18:00',
-            'night': '20:00',
-            'noon': '12:00',
-            'midnight': '00:00'
-        }
-        
-        return time_mappings.get(fuzzy_time)
+        return _FUZZY_TIME_MAPPINGS.get(fuzzy_time.lower())
     
     def _fuzzy_match_text(self, text: str, candidates: List[str], threshold: int = 80) -> Optional[str]:
         """
@@ -533,114 +744,64 @@ class GoalParser:
         if not FUZZYWUZZY_AVAILABLE:
             return None
         
-        matches = process.extractBests(
-            text, 
-            candidates, 
-            scorer=fuzz.token_sort_ratio,
-            score_cutoff=threshold
-        )
-        
-        if matches and len(matches) > 0 and len(matches[0]) > 0:
-            return matches[0][0]
+        # Scores come from the pair cache; the first candidate with the top score wins, as with extractBests
+        best_match = None
+        best_score = threshold - 1
+        for candidate in candidates:
+            score = _token_sort_ratio(text, candidate)
+            if score > best_score:
+                best_match, best_score = candidate, score
         
-        return None
+        return best_match
     
-    def _extract_duration(self, query: str) -> Optional[int]:
-        """Extract meeting duration from query"""
-        duration_patterns = [
-            r'(\d+)\s*(?:hour|hr)s?',
-            r'(\d+)\s*(?:minute|min)s?',
-            r'(\d+)\s*(?:hour|hr)s?\s*(\d+)\s*(?:minute|min)s?'
-        ]
-        
-        for pattern in duration_patterns:
-            match = re.search(pattern, query, re.IGNORECASE)
-            if match:
-                if len(match.groups()) == 2:
-                    # Hours and minutes
-                    hours = int(match.group(1))
-                    minutes = int(match.group(2))
-                    return hours * 60 + minutes
-                else:
-                    # Just hours or just minutes
-                    value = int(match.group(1))
-                    if 'hour' in pattern or 'hr' in pattern:
-                        return value * 60
-                    else:
-                        return value
+    def _extract_duration(self, query_lower: str) -> Optional[int]:
+        """Extract meeting duration from the lowercased query"""
+        if not _DIGIT_RE.search(query_lower):
+            return 60  # Default 1 hour
+        match = _DURATION_REGEX.search(query_lower)
+        if match:
+            value = int(match.group('value'))
+            if match.group('unit').startswith('h'):
+                # Hours, plus any minutes that follow
+                return value * 60 + int(match.group('minutes') or 0)
+            return value
         
         return 60  # Default 1 hour
     
-    def _extract_location(self, query: str) -> Optional[str]:
-        """Extract location from query, avoiding time expressions as locations."""
-        location_patterns = [
-            r'in\s+([^,]+)',
-            r'at\s+([^,]+)',
-            r'near\s+([^,]+)',
-            r'around\s+([^,]+)',
-            r'location[:\s]+([^,]+)',
-            r'venue[:\s]+([^,]+)'
-        ]
-        time_expressions = [
-            r'\b\d{1,2}:\d{2}(?:\s*(?:am|pm))?\b',
-            r'\b\d{1,2}\s*(?:am|pm)\b',
-            r'\bnoon\b', r'\bmidnight\b', r'\bmorning\b', r'\bevening\b', r'\bafternoon\b', r'\bnight\b'
-        ]
-        for pattern in location_patterns:
-            match = re.search(pattern, query, re.IGNORECASE)
+    def _extract_location(self, query_lower: str) -> Optional[str]:
+        """Extract location from the lowercased query, avoiding time expressions as locations."""
+        for pattern in _LOCATION_PATTERNS:
+            match = pattern.search(query_lower)
             if match:
                 location = match.group(1).strip()
                 # Clean up the location
-                location = re.sub(r'\s+', ' ', location)
+                location = ' '.join(location.split())
                 # Avoid time expressions as locations
-                for tpat in time_expressions:
-                    if re.search(tpat, location, re.IGNORECASE):
-                        location = None
-                        break
+                if _TIME_EXPRESSION_REGEX.search(location):
+                    location = None
                 if location and len(location) > 2:
-                    print(f"[GoalParser] Matched location: {location}")
+                    self.logger.debug("Matched location: %s", location)
                     return location
-        print(f"[GoalParser] No location matched in: {query}")
+        self.logger.debug("No location matched in: %s", query_lower)
         return None
     
-    def _extract_cuisine(self, query: str) -> Optional[str]:
-        """Extract cuisine type from query"""
-        cuisine_keywords = {
-            'indian': ['indian', 'curry', 'biryani', 'tandoori'],
-            'chinese': ['chinese', 'szechuan', 'cantonese'],
-            'italian': ['italian', 'pizza', 'pasta'],
-            'mexican': ['mexican', 'taco', 'burrito'],
-            'japanese': ['japanese', 'sushi', 'ramen'],
-            'thai': ['thai', 'pad thai'],
-            'mediterranean': ['mediterranean', 'greek', 'lebanese'],
-            'american': ['american', 'burger', 'steak'],
-            'hyderabadi': ['hyderabadi', 'biryani', 'haleem']
-        }
-        
-        query_lower = query.lower()
-        for cuisine, keywords in cuisine_keywords.items():
-            for keyword in keywords:
-                if keyword in query_lower:
-                    return cuisine.title()
+    def _extract_cuisine(self, query_lower: str) -> Optional[str]:
+        """Extract cuisine type from the lowercased query"""
+        # One scan finds every keyword; the lowest-ranked cuisine among them wins
+        hits = _scan_cuisines(query_lower)
+        if hits:
+            return min(hits)[1]
         
         return None
     
-    def _extract_team_size(self, query: str) -> Optional[int]:
-        """Extract team size from query"""
-        size_patterns = [
-            r'(\d+)\s*person\s*team',
-            r'(\d+)\s*people',
-            r'team\s+of\s+(\d+)',
-            r'(\d+)\s*attendees',
-            r'(\d+)\s*members'
-        ]
-        
-        for pattern in size_patterns:
-            match = re.search(pattern, query, re.IGNORECASE)
-            if match:
-                size = int(match.group(1))
-                if 1 <= size <= 50:  # Reasonable team size
-                    return size
+    def _extract_team_size(self, query_lower: str) -> Optional[int]:
+        """Extract team size from the lowercased query"""
+        if not _DIGIT_RE.search(query_lower):
+            return None
+        for match in _TEAM_SIZE_REGEX.finditer(query_lower):
+            size = int(match.group(1) or match.group(2))
+            if 1 <= size <= 50:  # Reasonable team size
+                return size
         
         return None
     
@@ -721,10 +882,20 @@ class GoalParser:
         filtered, emails, warnings = self.name_matcher._filter_names_and_emails(names)
         self.last_employee_warnings = warnings  # Store for later use in parse_goal
         # Always include all valid team member names found in the query
-        all_team_names = set(member['name'] for member in self.name_matcher.get_team_members())
+        team_names = self._get_team_name_index()
         found_names = set()
         for n in names:
-            for team_name in all_team_names:
-                if team_name.lower() in n.lower() or n.lower() in team_name.lower():
-                    found_names.add(team_name)
-        return list(found_names) + emails 
\ No newline at end of file
+            name_lower = n.lower()
+            # Substring containment either way, so 'ann' still finds both 'Ann Lee' and 'Joanne'
+            found_names.update(team_name for team_name, team_lower in team_names
+                               if team_lower in name_lower or name_lower in team_lower)
+        return list(found_names) + emails
+    
+    def _get_team_name_index(self) -> list:
+        """Return (name, lowercased name) for each team member, rebuilt when the roster changes"""
+        version, team_names = self._team_name_index
+        if version != self.name_matcher.roster_version:
+            version = self.name_matcher.roster_version
+            team_names = [(team_name, team_lower) for team_lower, team_name in self.name_matcher.team_names_lower]
+            self._team_name_index = (version, team_names)
+        return team_names
@@ -1,69 +1,73 @@
 """
 Task Planner for breaking goals into executable steps
 """
+from types import MappingProxyType
 from typing import Dict, Any, List, Optional
 
+# Task templates per goal type. They are the same for every planner, so they are built once and
+# exposed read-only; steps and field lists are tuples and create_plan copies steps into a list
+_TASK_TEMPLATES = {
+    'meeting': {
+        'type': 'meeting_scheduling',
+        'steps': (
+            'extract_meeting_details',
+            'check_availability',
+            'find_available_slots',
+            'present_options',
+            'get_confirmation',
+            'schedule_meeting',
+            'send_invites'
+        ),
+        'required_fields': ('date', 'employees'),
+        'optional_fields': ('time', 'duration', 'location', 'title')
+    },
+    'dinner': {
+        'type': 'restaurant_booking',
+        'steps': (
+            'extract_restaurant_details',
+            'search_restaurants',
+            'filter_by_criteria',
+            'present_options',
+            'get_confirmation',
+            'book_restaurant',
+            'send_invites'
+        ),
+        'required_fields': ('location',),
+        'optional_fields': ('cuisine', 'date', 'time', 'team_size', 'employees')
+    },
+    'availability': {
+        'type': 'availability_check',
+        'steps': (
+            'extract_availability_details',
+            'check_calendars',
+            'find_common_slots',
+            'present_results'
+        ),
+        'required_fields': ('date', 'employees'),
+        'optional_fields': ('time_range',)
+    },
+    'email': {
+        'type': 'send_email',
+        'steps': (
+            'extract_email_details',
+            'compose_email',
+            'send_email'
+        ),
+        'required_fields': ('recipients', 'message'),
+        'optional_fields': ('subject',)
+    }
+}
+TASK_TEMPLATES = MappingProxyType({
+    goal_type: MappingProxyType(template) for goal_type, template in _TASK_TEMPLATES.items()
+})
+
 class TaskPlanner:
     """
     Planner that breaks high-level goals into executable task plans
     """
     
     def __init__(self):
-        self.task_templates = self._load_task_templates()
-    
-    def _load_task_templates(self) -> Dict[str, Dict[str, Any]]:
-        """Load task templates for different goal types"""
-        return {
-            'meeting': {
-                'type': 'meeting_scheduling',
-                'steps': [
-                    'extract_meeting_details',
-                    'check_availability',
-                    'find_available_slots',
-                    'present_options',
-                    'get_confirmation',
-                    'schedule_meeting',
-                    'send_invites'
-                ],
-                'required_fields': ['date', 'employees'],
-                'optional_fields': ['time', 'duration', 'location', 'title']
-            },
-            'dinner': {
-                'type': 'restaurant_booking',
-                'steps': [
-                    'extract_restaurant_details',
-                    'search_restaurants',
-                    'filter_by_criteria',
-                    'present_options',
-                    'get_confirmation',
-                    'book_restaurant',
-                    'send_invites'
-                ],
-                'required_fields': ['location'],
-                'optional_fields': ['cuisine', 'date', 'time', 'team_size', 'employees']
-            },
-            'availability': {
-                'type': 'availability_check',
-                'steps': [
-                    'extract_availability_details',
-                    'check_calendars',
-                    'find_common_slots',
-                    'present_results'
-                ],
-                'required_fields': ['date', 'employees'],
-                'optional_fields': ['time_range']
-            },
-            'email': {
-                'type': 'send_email',
-                'steps': [
-                    'extract_email_details',
-                    'compose_email',
-                    'send_email'
-                ],
-                'required_fields': ['recipients', 'message'],
-                'optional_fields': ['subject']
-            }
-        }
+        self.task_templates = TASK_TEMPLATES
     
     def create_plan(self, goal_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -76,24 +80,22 @@ class TaskPlanner:
             Task plan dictionary or None
         """
         try:
-            goal_type = goal_info.get('type')
-            
-            if goal_type not in self.task_templates:
+            # One lookup both checks the goal type and fetches its template
+            template = self.task_templates.get(goal_info.get('type'))
+            if template is None:
                 return None
             
-            template = self.task_templates[goal_type]
-            
             # Create task plan
             task_plan = {
                 'type': template['type'],
-                'steps': template['steps'].copy(),
-                'details': goal_info.copy(),
+                'steps': list(template['steps']),
+                'details': dict(goal_info),
                 'current_step': 0,
                 'status': 'pending'
             }
             
             # Validate required fields
-            validation = self._validate_plan(task_plan)
+            validation = self._validate_plan(task_plan, template)
             if not validation['valid']:
                 task_plan['errors'] = validation['errors']
                 task_plan['status'] = 'invalid'
@@ -104,10 +106,11 @@ class TaskPlanner:
             print(f"Error creating task plan: {e}")
             return None
     
-    def _validate_plan(self, task_plan: Dict[str, Any]) -> Dict[str, Any]:
-        """Validate task plan"""
-        goal_type = task_plan['details'].get('type')
-        template = self.task_templates.get(goal_type, {})
+    def _validate_plan(self, task_plan: Dict[str, Any], template: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Validate task plan (template is looked up from the plan's goal type when not given)"""
+        if template is None:
+            goal_type = task_plan['details'].get('type')
+            template = self.task_templates.get(goal_type, {})
         
         required_fields = template.get('required_fields', [])
         details = task_plan['details']
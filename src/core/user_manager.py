@@ -1,11 +1,32 @@
 """
 User Manager for handling user data and preferences
 """
+import atexit
 import json
 import os
+import threading
+import weakref
+from functools import cached_property
 from typing import Dict, Any, List, Optional
 from pathlib import Path
-from config.settings import USER_PROFILES_PATH
+from config.settings import USER_PROFILES_PATH, USER_PROFILES_FLUSH_DELAY
+
+# Optional: faster JSON encoding (pip install orjson)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Managers with possibly pending saves; weak so registering for the exit flush doesn't keep them alive
+_LIVE_MANAGERS = weakref.WeakSet()
+
+def _flush_live_managers():
+    """Write any pending profile saves before the interpreter exits"""
+    for manager in list(_LIVE_MANAGERS):
+        manager.flush()
+
+atexit.register(_flush_live_managers)
 
 class UserManager:
     """
@@ -15,7 +36,14 @@ class UserManager:
     def __init__(self):
         self.profiles_path = Path(USER_PROFILES_PATH)
         self.profiles_path.parent.mkdir(parents=True, exist_ok=True)
+        # Saves are coalesced: mutators mark the profiles pending and a short timer writes them once
+        self._flush_lock = threading.Lock()
+        self._flush_timer = None
+        self._pending_profiles = None
+        _LIVE_MANAGERS.add(self)
         self.user_profiles = self._load_user_profiles()
+        # The "users" mapping itself, so lookups skip the outer get and its default dict
+        self._users = self.user_profiles.setdefault("users", {})
     
     def _load_user_profiles(self) -> Dict[str, Any]:
         """Load user profiles from file"""
@@ -27,6 +55,8 @@ class UserManager:
                 # Create default profiles
                 default_profiles = self._create_default_profiles()
                 self._save_user_profiles(default_profiles)
+                # Other components read the file at startup; create it now rather than after the delay
+                self.flush()
                 return default_profiles
         except Exception as e:
             print(f"Error loading user profiles: {e}")
@@ -51,12 +81,56 @@ class UserManager:
         }
     
     def _save_user_profiles(self, profiles: Dict[str, Any]):
-        """Save user profiles to file"""
-        try:
-            with open(self.profiles_path, 'w') as f:
-                json.dump(profiles, f, indent=2)
-        except Exception as e:
-            print(f"Error saving user profiles: {e}")
+        """Schedule user profiles to be saved; changes within USER_PROFILES_FLUSH_DELAY share one write"""
+        # Profiles changed; drop values derived from them
+        self.__dict__.pop('default_sender', None)
+        self.__dict__.pop('_name_index', None)
+        with self._flush_lock:
+            self._pending_profiles = profiles
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if USER_PROFILES_FLUSH_DELAY > 0:
+                self._flush_timer = threading.Timer(USER_PROFILES_FLUSH_DELAY, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        if USER_PROFILES_FLUSH_DELAY <= 0:
+            self.flush()
+    
+    def flush(self):
+        """Write any pending profile changes to file now"""
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            profiles, self._pending_profiles = self._pending_profiles, None
+            if profiles is None:
+                return
+            # Write a sibling temp file and rename it over the original so readers never see a partial file
+            tmp_path = self.profiles_path.with_suffix('.tmp')
+            try:
+                if ORJSON_AVAILABLE:
+                    tmp_path.write_bytes(orjson.dumps(profiles, option=orjson.OPT_INDENT_2))
+                else:
+                    with open(tmp_path, 'w') as f:
+                        json.dump(profiles, f, indent=2)
+                os.replace(tmp_path, self.profiles_path)
+            except Exception as e:
+                print(f"Error saving user profiles: {e}")
+    
+    @cached_property
+    def default_sender(self) -> Dict[str, Any]:
+        """First profile in user_profiles.json, used when no sender can be resolved (empty dict if none)"""
+        return next(iter(self._users.values()), {})
+    
+    @cached_property
+    def _name_index(self) -> Dict[str, Dict[str, Any]]:
+        """Normalized (lowercased, stripped) name -> profile; the first profile with a given name wins"""
+        index = {}
+        for profile in self._users.values():
+            name = (profile.get("name") or "").lower().strip()
+            index.setdefault(name, profile)
+        return index
     
     def get_user_profile(self, email: str) -> Optional[Dict[str, Any]]:
         """
@@ -68,7 +142,7 @@ class UserManager:
         Returns:
             User profile or None
         """
-        return self.user_profiles.get("users", {}).get(email)
+        return self._users.get(email)
     
     def create_user_profile(self, email: str, name: str, role: str = "user",
                           preferences: Dict[str, Any] = None) -> bool:
@@ -85,7 +159,7 @@ class UserManager:
             True if created successfully, False otherwise
         """
         try:
-            if email in self.user_profiles.get("users", {}):
+            if email in self._users:
                 return False  # User already exists
             
             user_profile = {
@@ -95,7 +169,7 @@ class UserManager:
                 "preferences": preferences or {}
             }
             
-            self.user_profiles["users"][email] = user_profile
+            self._users[email] = user_profile
             self._save_user_profiles(self.user_profiles)
             
             return True
@@ -116,10 +190,10 @@ class UserManager:
             True if updated successfully, False otherwise
         """
         try:
-            if email not in self.user_profiles.get("users", {}):
+            if email not in self._users:
                 return False
             
-            user_profile = self.user_profiles["users"][email]
+            user_profile = self._users[email]
             user_profile.update(updates)
             
             self._save_user_profiles(self.user_profiles)
@@ -140,10 +214,10 @@ class UserManager:
             True if deleted successfully, False otherwise
         """
         try:
-            if email not in self.user_profiles.get("users", {}):
+            if email not in self._users:
                 return False
             
-            del self.user_profiles["users"][email]
+            del self._users[email]
             self._save_user_profiles(self.user_profiles)
             
             return True
@@ -162,7 +236,7 @@ class UserManager:
         Returns:
             User preferences dictionary
         """
-        user_profile = self.get_user_profile(email)
+        user_profile = self._users.get(email)
         if user_profile:
             return user_profile.get("preferences", {})
         return {}
@@ -179,10 +253,10 @@ class UserManager:
             True if updated successfully, False otherwise
         """
         try:
-            if email not in self.user_profiles.get("users", {}):
+            if email not in self._users:
                 return False
             
-            user_profile = self.user_profiles["users"][email]
+            user_profile = self._users[email]
             current_preferences = user_profile.get("preferences", {})
             current_preferences.update(preferences)
             user_profile["preferences"] = current_preferences
@@ -201,7 +275,7 @@ class UserManager:
         Returns:
             List of user profiles
         """
-        users = self.user_profiles.get("users", {})
+        users = self._users
         return [
             {
                 "email": email,
@@ -221,7 +295,7 @@ class UserManager:
         Returns:
             True if user exists, False otherwise
         """
-        return email in self.user_profiles.get("users", {})
+        return email in self._users
     
     def get_user_role(self, email: str) -> str:
         """
@@ -233,10 +307,7 @@ class UserManager:
         Returns:
             User role
         """
-        user_profile = self.get_user_profile(email)
-        if user_profile:
-            return user_profile.get("role", "user")
-        return "user" 
+        return (self._users.get(email) or {}).get("role", "user")
 
     def get_user_profile_by_name(self, name: str) -> Optional[Dict[str, Any]]:
         """
@@ -246,11 +317,7 @@ class UserManager:
         Returns:
             User profile or None
         """
-        name_lower = name.lower().strip()
-        for profile in self.user_profiles.get("users", {}).values():
-            if profile.get("name", "").lower().strip() == name_lower:
-                return profile
-        return None
+        return self._name_index.get(name.lower().strip())
 
     def get_email_by_name(self, name: str) -> Optional[str]:
         profile = self.get_user_profile_by_name(name)
@@ -259,7 +326,7 @@ class UserManager:
         return None
 
     def get_name_by_email(self, email: str) -> Optional[str]:
-        profile = self.get_user_profile(email)
+        profile = self._users.get(email)
         if profile:
             return profile.get("name")
         return None 
\ No newline at end of file
@@ -0,0 +1,40 @@
+"""
+Shared error reporting for the service error handlers
+"""
+import sys
+from types import MappingProxyType
+
+# (category, kind) -> the fix printed after the error reason
+FIXES = MappingProxyType({
+    ('CALENDAR', 'google_auth'): "Google Calendar authentication failed. Check your credentials, token file, and API access.",
+    ('CALENDAR', 'google_api'): "Google Calendar API error. Check your API key, endpoint, and request payload.",
+    ('CALENDAR', 'sqlite'): "SQLite database error. Check your database file, schema, and permissions.",
+    ('CALENDAR', 'unknown'): "An unknown calendar error occurred. Check your logs and configuration.",
+    ('EMAIL', 'smtp'): "SMTP error. Check your SMTP server, credentials, and network connection.",
+    ('EMAIL', 'gmail_api'): "Gmail API error. Check your API key, OAuth credentials, and request payload.",
+    ('EMAIL', 'format'): "Email format error. Check your email addresses and message formatting.",
+    ('EMAIL', 'unknown'): "An unknown email error occurred. Check your logs and configuration.",
+    ('GEMINI', 'timeout'): "The Gemini API request timed out. Check your internet connection, firewall, or try increasing the timeout.",
+    ('GEMINI', 'connection'): "Could not connect to Gemini API. Check your internet connection, API URL, and firewall settings.",
+    ('GEMINI', 'http'): "Gemini API returned an HTTP error. Check your API key, endpoint, and request payload.",
+    ('GEMINI', 'request'): "A requests exception occurred. Check your network and Gemini API configuration.",
+    ('GEMINI', 'unknown'): "An unknown error occurred. Check your Gemini API key, endpoint, and logs for more details.",
+    ('LOCATION', 'geocoding_api'): "Geocoding API error. Check your API key, endpoint, and request payload.",
+    ('LOCATION', 'data'): "Location data error. Check your data source and formatting.",
+    ('LOCATION', 'unknown'): "An unknown location error occurred. Check your logs and configuration.",
+    ('RESTAURANT', 'google_places'): "Google Places API error. Check your API key, endpoint, and request payload.",
+    ('RESTAURANT', 'opentripmap'): "OpenTripMap API error. Check your API key, endpoint, and request payload.",
+    ('RESTAURANT', 'data'): "Restaurant data error. Check your data source and formatting.",
+    ('RESTAURANT', 'unknown'): "An unknown restaurant error occurred. Check your logs and configuration.",
+})
+
+def report(category: str, kind: str, error):
+    """
+    Print an error's reason and the matching fix in a single write
+    
+    Args:
+        category: Error category (CALENDAR, EMAIL, GEMINI, LOCATION, RESTAURANT)
+        kind: Kind of error within the category, as keyed in FIXES
+        error: The exception or message being reported
+    """
+    sys.stdout.write(f"[{category} ERROR] Reason: {error}\n[FIX] {FIXES[(category, kind)]}\n")
@@ -1,15 +1,7 @@
-def handle_google_calendar_auth_error(error):
-    print("[CALENDAR ERROR] Reason:", str(error))
-    print("[FIX] Google Calendar authentication failed. Check your credentials, token file, and API access.")
+from functools import partial
+from src.errors._registry import report
 
-def handle_google_calendar_api_error(error):
-    print("[CALENDAR ERROR] Reason:", str(error))
-    print("[FIX] Google Calendar API error. Check your API key, endpoint, and request payload.")
-
-def handle_sqlite_error(error):
-    print("[CALENDAR ERROR] Reason:", str(error))
-    print("[FIX] SQLite database error. Check your database file, schema, and permissions.")
-
-def handle_unknown_calendar_error(error):
-    print("[CALENDAR ERROR] Reason:", str(error))
-    print("[FIX] An unknown calendar error occurred. Check your logs and configuration.") 
\ No newline at end of file
+handle_google_calendar_auth_error = partial(report, 'CALENDAR', 'google_auth')
+handle_google_calendar_api_error = partial(report, 'CALENDAR', 'google_api')
+handle_sqlite_error = partial(report, 'CALENDAR', 'sqlite')
+handle_unknown_calendar_error = partial(report, 'CALENDAR', 'unknown')
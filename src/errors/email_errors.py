@@ -1,15 +1,7 @@
-def handle_smtp_error(error):
-    print("[EMAIL ERROR] Reason:", str(error))
-    print("[FIX] SMTP error. Check your SMTP server, credentials, and network connection.")
+from functools import partial
+from src.errors._registry import report
 
-def handle_gmail_api_error(error):
-    print("[EMAIL ERROR] Reason:", str(error))
-    print("[FIX] Gmail API error. Check your API key, OAuth credentials, and request payload.")
-
-def handle_email_format_error(error):
-    print("[EMAIL ERROR] Reason:", str(error))
-    print("[FIX] Email format error. Check your email addresses and message formatting.")
-
-def handle_unknown_email_error(error):
-    print("[EMAIL ERROR] Reason:", str(error))
-    print("[FIX] An unknown email error occurred. Check your logs and configuration.") 
\ No newline at end of file
+handle_smtp_error = partial(report, 'EMAIL', 'smtp')
+handle_gmail_api_error = partial(report, 'EMAIL', 'gmail_api')
+handle_email_format_error = partial(report, 'EMAIL', 'format')
+handle_unknown_email_error = partial(report, 'EMAIL', 'unknown')
@@ -1,11 +1,6 @@
-def handle_geocoding_api_error(error):
-    print("[LOCATION ERROR] Reason:", str(error))
-    print("[FIX] Geocoding API error. Check your API key, endpoint, and request payload.")
+from functools import partial
+from src.errors._registry import report
 
-def handle_location_data_error(error):
-    print("[LOCATION ERROR] Reason:", str(error))
-    print("[FIX] Location data error. Check your data source and formatting.")
-
-def handle_unknown_location_error(error):
-    print("[LOCATION ERROR] Reason:", str(error))
-    print("[FIX] An unknown location error occurred. Check your logs and configuration.") 
\ No newline at end of file
+handle_geocoding_api_error = partial(report, 'LOCATION', 'geocoding_api')
+handle_location_data_error = partial(report, 'LOCATION', 'data')
+handle_unknown_location_error = partial(report, 'LOCATION', 'unknown')
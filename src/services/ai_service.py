@@ -4,11 +4,16 @@ AI Service for generating email content and processing natural language using Ge
 import os
 import json
 import requests
+from src.utils.http_session import create_http_session
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List
-from config.settings import AI_MAX_TOKENS, AI_TEMPERATURE
+from config.settings import AI_MAX_TOKENS, AI_TEMPERATURE, AI_CACHE_MIN_TOKENS
 from datetime import datetime
 from src.errors import gemini_errors
 
+# Model families that accept explicit cachedContents; older ones (e.g. gemini-pro) only do implicit caching
+CACHEABLE_MODEL_PREFIXES = ("gemini-1.5-", "gemini-2")
+
 GEMINI_LOG_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../gemini_api.log'))
 
 def log_gemini_api(message: str):
@@ -29,6 +34,8 @@ class AIService:
         self.api_url = os.getenv("GEMINI_API_URL", "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent")
         self.max_tokens = AI_MAX_TOKENS
         self.temperature = AI_TEMPERATURE
+        # Every Gemini call goes to the same host, so keep the connection alive between them
+        self.session = create_http_session()
 
     def generate_email_content(self, email_type: str, details: Dict[str, Any]) -> str:
         prompt = self._create_email_prompt(email_type, details)
@@ -68,7 +75,59 @@ Generate a {email_type} email with the following details:
 Please write a professional email.
             """.strip()
 
-    def _generate_with_gemini(self, prompt: str) -> str:
+    def _api_base_and_model(self):
+        # api_url looks like <base>/models/<model>:generateContent
+        base, _, rest = self.api_url.partition('/models/')
+        return base, f"models/{rest.split(':', 1)[0]}"
+
+    def _can_cache_prefix(self, text: str) -> bool:
+        # Rough 4-characters-per-token estimate; prefixes under the model's minimum are rejected by the API
+        _, model = self._api_base_and_model()
+        return (model.split('/', 1)[-1].startswith(CACHEABLE_MODEL_PREFIXES)
+                and len(text) // 4 >= AI_CACHE_MIN_TOKENS)
+
+    def create_cached_prefix(self, text: str, ttl: int = 300) -> Optional[str]:
+        """
+        Store a prompt prefix in Gemini's context cache so later calls only prefill their suffix
+        
+        Args:
+            text: Shared prompt prefix
+            ttl: Seconds the cached content lives
+        
+        Returns:
+            Cached content name to pass as cached_content, or None if caching is
+            unavailable (e.g. the prefix is below the model's minimum cacheable size)
+        """
+        try:
+            base, model = self._api_base_and_model()
+            response = self.session.post(
+                f"{base}/cachedContents",
+                headers={"Content-Type": "application/json", "x-goog-api-key": self.api_key},
+                json={
+                    "model": model,
+                    "contents": [{"role": "user", "parts": [{"text": text}]}],
+                    "ttl": f"{ttl}s"
+                },
+                timeout=10
+            )
+            if response.status_code == 200:
+                name = response.json().get("name")
+                log_gemini_api(f"[CACHE CREATED] {name}")
+                return name
+            log_gemini_api(f"[CACHE UNAVAILABLE] {response.status_code} {response.text}")
+        except Exception as e:
+            log_gemini_api(f"[CACHE EXCEPTION] {str(e)}")
+        return None
+
+    def delete_cached_prefix(self, name: str):
+        """Delete cached content created by create_cached_prefix"""
+        try:
+            base, _ = self._api_base_and_model()
+            self.session.delete(f"{base}/{name}", headers={"x-goog-api-key": self.api_key}, timeout=10)
+        except Exception as e:
+            log_gemini_api(f"[CACHE DELETE EXCEPTION] {str(e)}")
+
+    def _generate_with_gemini(self, prompt: str, cached_content: Optional[str] = None) -> str:
         try:
             print(f"[DEBUG] Sending request to Gemini API...")
             log_gemini_api(f"[REQUEST] Prompt: {prompt}")
@@ -77,13 +136,15 @@ Please write a professional email.
                 "x-goog-api-key": self.api_key
             }
             payload = {
-                "contents": [{"parts": [{"text": prompt}]}],
+                "contents": [{"role": "user", "parts": [{"text": prompt}]}],
                 "generationConfig": {
                     "maxOutputTokens": self.max_tokens,
                     "temperature": self.temperature
                 }
             }
-            response = requests.post(self.api_url, headers=headers, json=payload, timeout=10)
+            if cached_content:
+                payload["cachedContent"] = cached_content
+            response = self.session.post(self.api_url, headers=headers, json=payload, timeout=10)
             print(f"[DEBUG] Gemini API response status: {response.status_code}")
             log_gemini_api(f"[RESPONSE STATUS] {response.status_code}")
             if response.status_code == 200:
@@ -112,6 +173,52 @@ Please write a professional email.
                 gemini_errors.handle_unknown_error(e)
             return f"[Gemini API error: {e}]"
 
+    def _generate_with_gemini_batch(self, prompts: List[str], max_workers: int = 8,
+                                    cached_content: Optional[str] = None) -> List[str]:
+        """
+        Generate responses for several prompts with concurrent Gemini requests
+        
+        Args:
+            prompts: Prompts to send
+            max_workers: Maximum number of requests in flight at once
+            cached_content: Optional cached prefix shared by every prompt
+        
+        Returns:
+            Responses in the same order as prompts (errors come back as the
+            same bracketed messages _generate_with_gemini returns)
+        """
+        if len(prompts) <= 1:
+            return [self._generate_with_gemini(prompt, cached_content) for prompt in prompts]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(prompts))) as executor:
+            return list(executor.map(lambda prompt: self._generate_with_gemini(prompt, cached_content), prompts))
+
+    def _generate_with_shared_prefix(self, shared_prefix: str, suffixes: List[str]) -> List[str]:
+        """
+        Generate one response per suffix, all sharing the same prompt prefix
+        
+        With more than one suffix, a prefix above AI_CACHE_MIN_TOKENS on a model that
+        supports explicit caching is put in Gemini's context cache so it is prefilled once;
+        otherwise the prefix is prepended to each suffix, which keeps the shared text first
+        for Gemini's implicit prefix caching without an extra cache round trip.
+        
+        Args:
+            shared_prefix: Invariant instructions and context
+            suffixes: Per-call variable parts
+        
+        Returns:
+            Responses in the same order as suffixes
+        """
+        cache_name = None
+        if len(suffixes) > 1 and self._can_cache_prefix(shared_prefix):
+            cache_name = self.create_cached_prefix(shared_prefix)
+        try:
+            if cache_name:
+                return self._generate_with_gemini_batch(suffixes, cached_content=cache_name)
+            return self._generate_with_gemini_batch([shared_prefix + suffix for suffix in suffixes])
+        finally:
+            if cache_name:
+                self.delete_cached_prefix(cache_name)
+
     def process_natural_language(self, query: str) -> Dict[str, Any]:
         prompt = f"Extract the intent and entities from the following user query: '{query}'\nReturn a JSON object with 'intent' and 'entities'."
         result = self._generate_with_gemini(prompt)
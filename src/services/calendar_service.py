@@ -3,18 +3,78 @@ Calendar Service for managing events and availability (supports Google Calendar
 """
 import os
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Any, Optional
 from pathlib import Path
-from config.settings import CALENDAR_SERVICE, CALENDAR_DB_PATH, DEFAULT_MEETING_DURATION, BUFFER_TIME
+from config.settings import (
+    CALENDAR_SERVICE, CALENDAR_DB_PATH, DEFAULT_MEETING_DURATION, BUFFER_TIME,
+    SCHEDULE_CACHE_TTL, SCHEDULE_CACHE_SIZE, AVAILABILITY_CACHE_TTL, WORKING_HOURS, DEFAULT_TIMEZONE
+)
 from src.services.email_service import EmailService
 
 # Google Calendar imports
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 from google.auth.transport.requests import Request
+import google_auth_httplib2
+import httplib2
+import numpy as np
+
+try:
+    from cachetools import TTLCache
+    CACHETOOLS_AVAILABLE = True
+except ImportError:
+    CACHETOOLS_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
 
 SCOPES = ['https://www.googleapis.com/auth/calendar']
+# Google's batch endpoint accepts at most 50 calls per HTTP request
+GOOGLE_BATCH_LIMIT = 50
+# Upper bound on batch requests in flight at once for large teams
+MAX_PARALLEL_BATCHES = 8
+
+
+@njit(cache=True)
+def _find_free_windows(busy_starts, busy_ends, day_start, day_end):
+    """
+    Sweep busy intervals (unix seconds) and return the gaps inside [day_start, day_end)
+    as an (n, 2) int64 array. Compiled with numba when it is installed.
+    """
+    order = np.argsort(busy_starts)
+    windows = np.empty((busy_starts.shape[0] + 1, 2), dtype=np.int64)
+    n = 0
+    cursor = day_start
+    for i in order:
+        start = busy_starts[i]
+        end = busy_ends[i]
+        if end <= cursor:
+            continue
+        if start >= day_end:
+            break
+        if start > cursor:
+            windows[n, 0] = cursor
+            windows[n, 1] = start
+            n += 1
+        cursor = end
+        if cursor >= day_end:
+            break
+    if cursor < day_end:
+        windows[n, 0] = cursor
+        windows[n, 1] = day_end
+        n += 1
+    return windows[:n]
 
 class CalendarService:
     """
@@ -23,13 +83,24 @@ class CalendarService:
     Supports multi-user cal_token.json
     """
     
-    def __init__(self, user_email=None):
+    def __init__(self, user_email=None, schedule_cache=None):
         self.service = "google"
         self.db_path = Path(CALENDAR_DB_PATH)  # Not used, but kept for compatibility
         self.google_creds = None
         self.google_service = None
         self.email_service = EmailService()
         self.active_user_email = user_email
+        self._local = threading.local()
+        # Short-lived cache of other users' schedules keyed by (viewer, calendar, start, end)
+        if schedule_cache is None and CACHETOOLS_AVAILABLE:
+            schedule_cache = TTLCache(maxsize=SCHEDULE_CACHE_SIZE, ttl=SCHEDULE_CACHE_TTL)
+        self.schedule_cache = schedule_cache
+        # Free/busy answers for a slot, keyed by (viewer, date, start, end, attendees, timezone)
+        self.availability_cache = (
+            TTLCache(maxsize=SCHEDULE_CACHE_SIZE, ttl=AVAILABILITY_CACHE_TTL) if CACHETOOLS_AVAILABLE else None
+        )
+        self._schedule_cache_lock = threading.Lock()
+        self.cache_stats = {'hits': 0, 'misses': 0, 'availability_hits': 0, 'availability_misses': 0}
         self._init_google_calendar(user_email)
 
     def _init_google_calendar(self, user_email=None):
@@ -69,10 +140,64 @@ class CalendarService:
 
     def switch_user(self, user_email):
         self._init_google_calendar(user_email)
+        self._local = threading.local()
+
+    def _thread_http(self):
+        # httplib2.Http is not thread-safe, so each worker thread gets its own transport
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = google_auth_httplib2.AuthorizedHttp(self.google_creds, http=httplib2.Http())
+            self._local.http = http
+        return http
+
+    def _cached_schedule(self, calendar_id: str, start_date: date, end_date: date):
+        if self.schedule_cache is None:
+            return None
+        with self._schedule_cache_lock:
+            events = self.schedule_cache.get((self.active_user_email, calendar_id.lower(), start_date, end_date))
+            self.cache_stats['hits' if events is not None else 'misses'] += 1
+            return events
+
+    def _store_schedule(self, calendar_id: str, start_date: date, end_date: date, events: List[Dict[str, Any]]):
+        if self.schedule_cache is None:
+            return
+        with self._schedule_cache_lock:
+            self.schedule_cache[(self.active_user_email, calendar_id.lower(), start_date, end_date)] = events
+
+    def invalidate_schedules(self, user_emails: List[str], target_date) -> None:
+        """
+        Drop cached schedules of the given users that cover a date
+        
+        Args:
+            user_emails: Calendar IDs whose cached schedules are stale
+            target_date: Date that changed
+        """
+        target_date_obj = self._ensure_date_object(target_date)
+        if not target_date_obj:
+            return
+        emails = {email.lower() for email in user_emails if isinstance(email, str)}
+        with self._schedule_cache_lock:
+            if self.schedule_cache is not None:
+                stale = [key for key in list(self.schedule_cache.keys())
+                         if key[1] in emails and key[2] <= target_date_obj <= key[3]]
+                for key in stale:
+                    self.schedule_cache.pop(key, None)
+            # Any slot check on that date may now see the change (the organizer's calendar included)
+            if self.availability_cache is not None:
+                for key in [key for key in list(self.availability_cache.keys()) if key[1] == target_date_obj]:
+                    self.availability_cache.pop(key, None)
+    
+    def _clear_availability_cache(self) -> None:
+        # Used when the changed event's date isn't known
+        if self.availability_cache is not None:
+            with self._schedule_cache_lock:
+                self.availability_cache.clear()
 
     def create_event(self, event_details: Dict[str, Any]) -> bool:
         result = self._create_event_google(event_details)
         if result:
+            # Attendees' cached schedules no longer include the new event
+            self.invalidate_schedules(event_details.get('attendees', []), event_details.get('date'))
             self.email_service.send_event_notification(event_details, 'created', event_details.get('organizer', 'assistant@company.com'))
         return result
 
@@ -104,7 +229,7 @@ class CalendarService:
                 },
                 'attendees': [{'email': email} for email in attendees],
             }
-            self.google_service.events().insert(calendarId='primary', body=event).execute()
+            self.google_service.events().insert(calendarId='primary', body=event).execute(http=self._thread_http())
             return True
         except Exception as e:
             print(f"Google Calendar API error: {e}")
@@ -118,31 +243,248 @@ class CalendarService:
             return []
         return self._get_events_google(start_date_obj, end_date_obj, user_email)
 
-    def _get_events_google(self, start_date: date, end_date: date, user_email: str = None) -> List[Dict[str, Any]]:
+    def get_user_schedule(self, user_email: str, start_date, end_date) -> List[Dict[str, Any]]:
+        """Get the events on another user's calendar between two dates (inclusive)"""
+        start_date_obj = self._ensure_date_object(start_date)
+        end_date_obj = self._ensure_date_object(end_date)
+        if not start_date_obj or not end_date_obj:
+            print(f"Error getting schedule: Invalid date format - start_date: {start_date}, end_date: {end_date}")
+            return []
+        cached = self._cached_schedule(user_email, start_date_obj, end_date_obj)
+        if cached is not None:
+            return cached
+        events = self._get_events_google(start_date_obj, end_date_obj, calendar_id=user_email)
+        self._store_schedule(user_email, start_date_obj, end_date_obj, events)
+        return events
+
+    def batch_get_schedules(self, user_emails: List[str], target_date) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get several users' events for one day, multiplexing up to 50 calendars per HTTP round trip
+        
+        Args:
+            user_emails: Calendar IDs (email addresses) to fetch
+            target_date: Day to fetch
+        
+        Returns:
+            Dictionary mapping each email to its list of events (empty on error)
+        """
+        return self.get_events_batched(user_emails, target_date, target_date)
+    
+    def get_events_batched(self, user_emails: List[str], start_date, end_date,
+                           use_cache: bool = True) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get several users' events between two dates (inclusive) with batched API requests
+        
+        Args:
+            user_emails: Calendar IDs (email addresses) to fetch
+            start_date: First day to fetch
+            end_date: Last day to fetch
+            use_cache: Serve and store results through the schedule cache; pass False
+                when the caller is about to modify the events
+        
+        Returns:
+            Dictionary mapping each email to its list of events (empty on error)
+        """
+        start_date_obj = self._ensure_date_object(start_date)
+        end_date_obj = self._ensure_date_object(end_date)
+        schedules = {email: [] for email in user_emails}
+        if not start_date_obj or not end_date_obj:
+            print(f"Error getting schedules: Invalid date format - start_date: {start_date}, end_date: {end_date}")
+            return schedules
+        
+        time_min, time_max = self._google_time_range(start_date_obj, end_date_obj)
+        
+        def on_response(request_id, response, exception):
+            if exception is not None:
+                print(f"Error getting events for {request_id} from Google Calendar: {exception}")
+                return
+            events = [self._format_google_event(event) for event in response.get('items', [])]
+            schedules[request_id] = events
+            if use_cache:
+                self._store_schedule(request_id, start_date_obj, end_date_obj, events)
+        
+        # Only go to the API for calendars not already cached
+        missing_emails = []
+        for email in schedules:
+            cached = self._cached_schedule(email, start_date_obj, end_date_obj) if use_cache else None
+            if cached is not None:
+                schedules[email] = cached
+            else:
+                missing_emails.append(email)
+        
+        def run_batch(chunk):
+            # Each chunk gets its own batch request; a failed chunk doesn't abort the others
+            try:
+                batch = self.google_service.new_batch_http_request(callback=on_response)
+                for email in chunk:
+                    batch.add(self.google_service.events().list(
+                        calendarId=email,
+                        timeMin=time_min,
+                        timeMax=time_max,
+                        singleEvents=True,
+                        orderBy='startTime'
+                    ), request_id=email)
+                batch.execute(http=self._thread_http())
+            except Exception as e:
+                print(f"Error batch-getting events from Google Calendar: {e}")
+        
+        chunks = [missing_emails[i:i + GOOGLE_BATCH_LIMIT]
+                  for i in range(0, len(missing_emails), GOOGLE_BATCH_LIMIT)]
+        if len(chunks) == 1:
+            run_batch(chunks[0])
+        elif chunks:
+            # Callbacks write distinct keys and the schedule cache is locked, so chunks can overlap
+            with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_BATCHES, len(chunks))) as executor:
+                list(executor.map(run_batch, chunks))
+        return schedules
+
+    def get_team_freebusy(self, user_emails: List[str], target_date,
+                          errors: Optional[Dict[str, str]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get busy intervals for a whole team with the FreeBusy API
+        
+        One freebusy.query covers up to 50 calendars and returns only intervals,
+        which is far cheaper than listing every event on each calendar.
+        
+        Args:
+            user_emails: Calendar IDs (email addresses) to query
+            target_date: Day to query
+            errors: Optional dictionary filled with email -> error message for calendars
+                that could not be read; their schedules are left empty
+        
+        Returns:
+            Dictionary mapping each email to its busy intervals in schedule shape
+        """
+        if errors is None:
+            errors = {}
+        target_date_obj = self._ensure_date_object(target_date)
+        schedules = {email: [] for email in user_emails}
+        if not target_date_obj:
+            print(f"Error getting free/busy: Invalid date format - target_date: {target_date}")
+            errors.update((email, f"Invalid date format: {target_date}") for email in schedules)
+            return schedules
+        
+        time_min, time_max = self._google_time_range(target_date_obj, target_date_obj)
+        unique_emails = list(schedules)
+        for i in range(0, len(unique_emails), GOOGLE_BATCH_LIMIT):
+            chunk = unique_emails[i:i + GOOGLE_BATCH_LIMIT]
+            body = {
+                'timeMin': time_min,
+                'timeMax': time_max,
+                'items': [{'id': email} for email in chunk]
+            }
+            # A failed query only affects the calendars in its own chunk
+            try:
+                calendars = self.google_service.freebusy().query(body=body).execute(
+                    http=self._thread_http()
+                ).get('calendars', {})
+            except Exception as e:
+                print(f"Error getting free/busy from Google Calendar: {e}")
+                errors.update((email, str(e)) for email in chunk)
+                continue
+            for email in chunk:
+                info = calendars.get(email)
+                if info is None:
+                    errors[email] = 'No free/busy data returned'
+                    continue
+                if info.get('errors'):
+                    print(f"Error getting free/busy for {email}: {info['errors']}")
+                    errors[email] = ', '.join(err.get('reason', 'unknown') for err in info['errors'])
+                schedules[email] = [{
+                    'id': None,
+                    'title': 'Busy',
+                    'description': '',
+                    'start_time': period['start'],
+                    'end_time': period['end'],
+                    'location': '',
+                    'attendees': [],
+                    'organizer': email
+                } for period in info.get('busy', [])]
+        return schedules
+
+    def find_common_free_windows(self, schedules: Dict[str, List[Dict[str, Any]]], target_date,
+                                 min_duration: int = 30) -> List[Dict[str, Any]]:
+        """
+        Find working-hour windows on a date when nobody in the schedules is busy
+        
+        Args:
+            schedules: Dictionary mapping emails to event/busy lists (start_time, end_time)
+            target_date: Day to search
+            min_duration: Shortest window to report, in minutes
+        
+        Returns:
+            List of free windows with start_time, end_time and duration (minutes)
+        """
+        target_date_obj = self._ensure_date_object(target_date)
+        if not target_date_obj:
+            return []
+        try:
+            import pytz
+            tzinfo = pytz.timezone(DEFAULT_TIMEZONE)
+            day_start = int(tzinfo.localize(self._parse_datetime(target_date_obj, WORKING_HOURS['start'])).timestamp())
+            day_end = int(tzinfo.localize(self._parse_datetime(target_date_obj, WORKING_HOURS['end'])).timestamp())
+            
+            intervals = [
+                (self._to_timestamp(event['start_time'], tzinfo), self._to_timestamp(event['end_time'], tzinfo))
+                for events in schedules.values() if isinstance(events, list)
+                for event in events
+            ]
+            count = len(intervals)
+            busy_starts = np.fromiter((start for start, _ in intervals), dtype=np.int64, count=count)
+            busy_ends = np.fromiter((end for _, end in intervals), dtype=np.int64, count=count)
+            windows = _find_free_windows(busy_starts, busy_ends, day_start, day_end)
+            
+            free = []
+            for start, end in windows:
+                duration = int(end - start) // 60
+                if duration < min_duration:
+                    continue
+                free.append({
+                    'start_time': datetime.fromtimestamp(int(start), tzinfo).strftime('%H:%M'),
+                    'end_time': datetime.fromtimestamp(int(end), tzinfo).strftime('%H:%M'),
+                    'duration': duration
+                })
+            return free
+        except Exception as e:
+            print(f"Error finding common free windows: {e}")
+            return []
+
+    def _to_timestamp(self, value: str, tzinfo) -> int:
+        # Google returns RFC 3339 date-times ('...Z' or with offset) or bare dates for all-day events
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if parsed.tzinfo is None:
+            parsed = tzinfo.localize(parsed)
+        return int(parsed.timestamp())
+
+    def _google_time_range(self, start_date: date, end_date: date):
+        time_min = datetime.combine(start_date, datetime.min.time()).isoformat() + 'Z'
+        time_max = datetime.combine(end_date, datetime.max.time()).isoformat() + 'Z'
+        return time_min, time_max
+
+    def _format_google_event(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'id': event.get('id'),
+            'title': event.get('summary', ''),
+            'description': event.get('description', ''),
+            'start_time': event['start'].get('dateTime', event['start'].get('date')),
+            'end_time': event['end'].get('dateTime', event['end'].get('date')),
+            'location': event.get('location', ''),
+            'attendees': [att['email'] for att in event.get('attendees', [])] if event.get('attendees') else [],
+            'organizer': event.get('organizer', {}).get('email', '')
+        }
+
+    def _get_events_google(self, start_date: date, end_date: date, user_email: str = None,
+                           calendar_id: str = 'primary') -> List[Dict[str, Any]]:
         try:
-            events = []
-            time_min = datetime.combine(start_date, datetime.min.time()).isoformat() + 'Z'
-            time_max = datetime.combine(end_date, datetime.max.time()).isoformat() + 'Z'
-            calendar_id = 'primary'
+            time_min, time_max = self._google_time_range(start_date, end_date)
             results = self.google_service.events().list(
                 calendarId=calendar_id,
                 timeMin=time_min,
                 timeMax=time_max,
                 singleEvents=True,
                 orderBy='startTime'
-            ).execute()
-            for event in results.get('items', []):
-                events.append({
-                    'id': event.get('id'),
-                    'title': event.get('summary', ''),
-                    'description': event.get('description', ''),
-                    'start_time': event['start'].get('dateTime', event['start'].get('date')),
-                    'end_time': event['end'].get('dateTime', event['end'].get('date')),
-                    'location': event.get('location', ''),
-                    'attendees': [att['email'] for att in event.get('attendees', [])] if event.get('attendees') else [],
-                    'organizer': event.get('organizer', {}).get('email', '')
-                })
-            return events
+            ).execute(http=self._thread_http())
+            return [self._format_google_event(event) for event in results.get('items', [])]
         except Exception as e:
             print(f"Error getting events from Google Calendar: {e}")
             return []
@@ -150,13 +492,15 @@ class CalendarService:
     def delete_event(self, event_id: str) -> bool:
         event_details = self._get_event_details_by_id(event_id)
         result = self._delete_event_google(event_id)
+        if result:
+            self._clear_availability_cache()
         if result and event_details:
             self.email_service.send_event_notification(event_details, 'deleted', event_details.get('organizer', 'assistant@company.com'))
         return result
 
     def _delete_event_google(self, event_id: str) -> bool:
         try:
-            self.google_service.events().delete(calendarId='primary', eventId=event_id).execute()
+            self.google_service.events().delete(calendarId='primary', eventId=event_id).execute(http=self._thread_http())
             return True
         except Exception as e:
             print(f"Error deleting event from Google Calendar: {e}")
@@ -165,13 +509,14 @@ class CalendarService:
     def update_event(self, event_id: str, event_details: Dict[str, Any]) -> bool:
         result = self._update_event_google(event_id, event_details)
         if result:
+            self._clear_availability_cache()
             self.email_service.send_event_notification(event_details, 'modified', event_details.get('organizer', 'assistant@company.com'))
         return result
 
     def _update_event_google(self, event_id: str, event_details: Dict[str, Any]) -> bool:
         try:
             # Google Calendar API does not have a direct "update event by ID"; you must patch the event
-            self.google_service.events().patch(calendarId='primary', eventId=event_id, body=event_details).execute()
+            self.google_service.events().patch(calendarId='primary', eventId=event_id, body=event_details).execute(http=self._thread_http())
             return True
         except Exception as e:
             print(f"Error updating event in Google Calendar: {e}")
@@ -227,7 +572,22 @@ class CalendarService:
                 'conflicts': [],
                 'error': f"Invalid date format: {target_date}"
             }
-        return self._check_availability_google(target_date_obj, start_time, end_time, user_emails, timezone=timezone)
+        if self.availability_cache is None:
+            return self._check_availability_google(target_date_obj, start_time, end_time, user_emails, timezone=timezone)
+        
+        # Re-checking the same slot (e.g. while the user flips between options) reuses the answer
+        key = (self.active_user_email, target_date_obj, start_time, end_time,
+               frozenset(email.lower() for email in user_emails), timezone)
+        with self._schedule_cache_lock:
+            cached = self.availability_cache.get(key)
+            self.cache_stats['availability_hits' if cached is not None else 'availability_misses'] += 1
+        if cached is not None:
+            return dict(cached)
+        result = self._check_availability_google(target_date_obj, start_time, end_time, user_emails, timezone=timezone)
+        if 'error' not in result:
+            with self._schedule_cache_lock:
+                self.availability_cache[key] = dict(result)
+        return result
 
     def _check_availability_google(self, target_date: date, start_time: str, end_time: str, user_emails: List[str], timezone=None) -> Dict[str, Any]:
         try:
@@ -247,7 +607,7 @@ class CalendarService:
                 "timeZone": tz,
                 "items": [{"id": email} for email in user_emails]
             }
-            freebusy_result = self.google_service.freebusy().query(body=body).execute()
+            freebusy_result = self.google_service.freebusy().query(body=body).execute(http=self._thread_http())
             for email in user_emails:
                 busy_periods = freebusy_result['calendars'].get(email, {}).get('busy', [])
                 if busy_periods:
@@ -4,11 +4,19 @@ Email Service for sending automated emails
 import os
 import smtplib
 import json
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-from config.settings import EMAIL_SERVICE, EMAIL_TONE
+from config.settings import (
+    EMAIL_SERVICE, EMAIL_TONE, SMTP_POOL_SIZE, SMTP_MESSAGES_PER_CONNECTION, SMTP_CONNECTION_TTL,
+    SMTP_RECIPIENTS_PER_ENVELOPE
+)
 
 # Gmail API imports
 try:
@@ -18,12 +26,33 @@ try:
     import base64
     from email.mime.text import MIMEText
     from google.auth.transport.requests import Request
+    import google_auth_httplib2
+    import httplib2
     GMAIL_API_AVAILABLE = True
 except ImportError:
     GMAIL_API_AVAILABLE = False
 
 GMAIL_SCOPES = ['https://www.googleapis.com/auth/gmail.send']
 
+# Body of the notice sent when a calendar event is created, deleted or modified
+_EVENT_NOTIFICATION_TMPL = """
+Hello,
+
+This is to notify you that the following calendar event was {action}:
+
+- Title: {title}
+- Date: {date}
+- Time: {time}
+- Location: {location}
+- Organizer: {organizer}
+- Attendees: {attendees}
+
+If you have any questions, please contact the organizer.
+
+Best regards,
+Proactive Work-Life Assistant
+"""
+
 class EmailService:
     """
     Email service for sending automated emails
@@ -43,6 +72,7 @@ class EmailService:
         
         self.gmail_creds = None
         self.gmail_service = None
+        self._local = threading.local()
         if self.service == "gmail" and GMAIL_API_AVAILABLE:
             self._init_gmail()
         elif self.service == "smtp":
@@ -59,6 +89,77 @@ class EmailService:
         self.smtp_port = int(os.getenv("SMTP_PORT", "587"))
         if not self.smtp_email or not self.smtp_password:
             raise EnvironmentError("SMTP_EMAIL and/or SMTP_PASSWORD are missing in your .env file. Please add them and restart the app.")
+        # Idle authenticated connections as [server, opened_at, messages_sent]
+        self._smtp_pool = queue.Queue(maxsize=SMTP_POOL_SIZE)
+    
+    def _open_smtp_connection(self) -> list:
+        """Open, secure and authenticate a new SMTP connection"""
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        try:
+            server.starttls()
+            server.login(self.smtp_email, self.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        return [server, time.monotonic(), 0]
+    
+    @staticmethod
+    def _close_smtp_connection(conn: list):
+        """Close a pooled SMTP connection, ignoring errors from dead sockets"""
+        try:
+            conn[0].quit()
+        except Exception:
+            try:
+                conn[0].close()
+            except Exception:
+                pass
+    
+    def _acquire_smtp_connection(self) -> list:
+        """
+        Take a live connection from the pool, opening a new one if none is usable
+        
+        Returns:
+            Pooled connection entry [server, opened_at, messages_sent]
+        """
+        while True:
+            try:
+                conn = self._smtp_pool.get_nowait()
+            except queue.Empty:
+                return self._open_smtp_connection()
+            
+            if time.monotonic() - conn[1] > SMTP_CONNECTION_TTL:
+                self._close_smtp_connection(conn)
+                continue
+            try:
+                # Reset any leftover transaction state from the previous message
+                if conn[0].rset()[0] == 250:
+                    return conn
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close_smtp_connection(conn)
+    
+    def _release_smtp_connection(self, conn: list):
+        """Return a connection to the pool, or close it if it is spent or the pool is full"""
+        conn[2] += 1
+        if conn[2] >= SMTP_MESSAGES_PER_CONNECTION:
+            self._close_smtp_connection(conn)
+            return
+        try:
+            self._smtp_pool.put_nowait(conn)
+        except queue.Full:
+            self._close_smtp_connection(conn)
+    
+    def close(self):
+        """Close all pooled SMTP connections"""
+        pool = getattr(self, '_smtp_pool', None)
+        if pool is None:
+            return
+        while True:
+            try:
+                conn = pool.get_nowait()
+            except queue.Empty:
+                break
+            self._close_smtp_connection(conn)
     
     def _init_local(self):
         """Initialize local email service (save to files)"""
@@ -96,6 +197,14 @@ class EmailService:
         self.gmail_creds = creds
         self.gmail_service = build('gmail', 'v1', credentials=creds)
     
+    def _thread_http(self):
+        # httplib2.Http is not thread-safe, so concurrent Gmail sends each get their own transport
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = google_auth_httplib2.AuthorizedHttp(self.gmail_creds, http=httplib2.Http())
+            self._local.http = http
+        return http
+    
     def send_email(self, to_emails: List[str], subject: str, content: str, from_email: str = None, cc_emails: List[str] = None) -> bool:
         if self.service == "gmail" and self.gmail_service:
             return self._send_with_gmail(to_emails, subject, content, from_email, cc_emails)
@@ -123,28 +232,126 @@ class EmailService:
             
             # Add body
             msg.attach(MIMEText(content, 'plain'))
+            message = msg.as_string()
             
-            # Connect to SMTP server
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.smtp_email, self.smtp_password)
-            
-            # Send email
+            # Send email; large recipient lists are split into envelopes that go out side by
+            # side on separate pooled connections (the headers still list everyone)
             all_recipients = to_emails + (cc_emails or [])
-            server.sendmail(self.smtp_email, all_recipients, msg.as_string())
-            server.quit()
+            chunks = [all_recipients[i:i + SMTP_RECIPIENTS_PER_ENVELOPE]
+                      for i in range(0, len(all_recipients), SMTP_RECIPIENTS_PER_ENVELOPE)]
+            if len(chunks) <= 1:
+                refused = self._send_envelope(all_recipients, message)
+                accepted = True
+            else:
+                # Other envelopes may already be delivered when one fails, so a failed envelope
+                # only counts against its own recipients; the send fails if none got through
+                refused = {}
+                accepted = False
+                with ThreadPoolExecutor(max_workers=min(SMTP_POOL_SIZE, len(chunks))) as executor:
+                    futures = [(chunk, executor.submit(self._send_envelope, chunk, message)) for chunk in chunks]
+                    for chunk, future in futures:
+                        try:
+                            refused.update(future.result())
+                            accepted = True
+                        except smtplib.SMTPRecipientsRefused as e:
+                            refused.update(e.recipients)
+                        except Exception as e:
+                            refused.update((addr, (None, str(e))) for addr in chunk)
+            if refused:
+                print(f"SMTP refused recipients: {refused}")
             
-            return True
+            return accepted
             
         except Exception as e:
             print(f"SMTP error: {e}")
             return False
     
+    def _send_envelope(self, recipients: List[str], message: str):
+        """
+        Deliver one message to a set of recipients over a pooled SMTP connection
+        
+        Args:
+            recipients: Envelope recipients
+            message: Serialized message
+        
+        Returns:
+            Recipients the server refused, as smtplib.SMTP.sendmail reports them
+        """
+        # Reuse a pooled connection instead of a fresh TCP+TLS+LOGIN handshake
+        conn = self._acquire_smtp_connection()
+        try:
+            try:
+                refused = self._sendmail(conn[0], self.smtp_email, recipients, message)
+            except OSError as e:
+                # SMTPException subclasses OSError; only a dropped connection is worth a retry
+                if isinstance(e, smtplib.SMTPException) and not isinstance(e, smtplib.SMTPServerDisconnected):
+                    raise
+                # Connection went stale while idle; retry once on a fresh one
+                self._close_smtp_connection(conn)
+                conn = self._open_smtp_connection()
+                refused = self._sendmail(conn[0], self.smtp_email, recipients, message)
+        except Exception:
+            self._close_smtp_connection(conn)
+            raise
+        self._release_smtp_connection(conn)
+        return refused
+    
+    def _sendmail(self, server: smtplib.SMTP, from_addr: str, to_addrs: List[str], message: str) -> Dict[str, tuple]:
+        """
+        Send one message, pipelining the envelope when the server supports it (RFC 2920)
+        
+        MAIL FROM, every RCPT TO and DATA go out in a single write and their replies
+        are read back in order, so the envelope costs one round trip instead of N+2.
+        Like smtplib.SMTP.sendmail, raises SMTPRecipientsRefused only when every
+        recipient is refused and otherwise returns the refused ones.
+        """
+        server.ehlo_or_helo_if_needed()
+        if not server.has_extn('pipelining'):
+            return server.sendmail(from_addr, to_addrs, message)
+        
+        commands = [f"MAIL FROM:{smtplib.quoteaddr(from_addr)}"]
+        commands.extend(f"RCPT TO:{smtplib.quoteaddr(addr)}" for addr in to_addrs)
+        commands.append("DATA")
+        server.send(''.join(command + '\r\n' for command in commands))
+        
+        mail_code, mail_resp = server.getreply()
+        refused = {}
+        for addr in to_addrs:
+            code, resp = server.getreply()
+            if code not in (250, 251):
+                refused[addr] = (code, resp)
+        data_code, data_resp = server.getreply()
+        
+        if mail_code != 250 or len(refused) == len(to_addrs) or data_code != 354:
+            if data_code == 354:
+                # Server accepted DATA anyway; end it with an empty body before resetting
+                server.send('.\r\n')
+                server.getreply()
+            server.rset()
+            if mail_code != 250:
+                raise smtplib.SMTPSenderRefused(mail_code, mail_resp, from_addr)
+            if len(refused) == len(to_addrs):
+                raise smtplib.SMTPRecipientsRefused(refused)
+            raise smtplib.SMTPDataError(data_code, data_resp)
+        
+        # Normalise line endings and dot-stuff as smtplib.SMTP.data() does
+        body = re.sub(r'(?:\r\n|\n|\r(?!\n))', '\r\n', message)
+        body = re.sub(r'(?m)^\.', '..', body)
+        if not body.endswith('\r\n'):
+            body += '\r\n'
+        server.send((body + '.\r\n').encode('ascii'))
+        code, resp = server.getreply()
+        if code != 250:
+            server.rset()
+            raise smtplib.SMTPDataError(code, resp)
+        return refused
+    
     def _send_with_local(self, to_emails: List[str], subject: str, content: str,
                         from_email: str = None, cc_emails: List[str] = None) -> bool:
         """Save email to local file"""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # Microseconds keep emails saved in the same second (e.g. concurrent sends) apart
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
             filename = f"email_{timestamp}.json"
             filepath = os.path.join(self.email_dir, filename)
             
@@ -207,7 +414,7 @@ class EmailService:
                 message['cc'] = ', '.join(cc_emails)
             raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
             send_message = {'raw': raw_message}
-            self.gmail_service.users().messages().send(userId="me", body=send_message).execute()
+            self.gmail_service.users().messages().send(userId="me", body=send_message).execute(http=self._thread_http())
             return True
         except Exception as e:
             print(f"Gmail API error: {e}")
@@ -518,27 +725,21 @@ Sincerely,
             True if sent successfully, False otherwise
         """
         try:
-            subject = f"[Calendar Event {action.title()}] {event_details.get('title', 'Event')} on {event_details.get('date', '')}"
+            title = event_details.get('title', 'Event')
+            event_date = event_details.get('date', '')
+            subject = f"[Calendar Event {action.title()}] {title} on {event_date}"
             attendees = [a for a in event_details.get('attendees', []) if isinstance(a, str) and a.strip()]
             organizer = event_details.get('organizer', sender_email)
             to_emails = list(set([a for a in attendees + [organizer] if isinstance(a, str) and a.strip()]))
-            content = f"""
-Hello,
-
-This is to notify you that the following calendar event was {action}:
-
-- Title: {event_details.get('title', 'Event')}
-- Date: {event_details.get('date', '')}
-- Time: {event_details.get('time', '')}
-- Location: {event_details.get('location', '')}
-- Organizer: {organizer}
-- Attendees: {', '.join(attendees)}
-
-If you have any questions, please contact the organizer.
-
-Best regards,
-Proactive Work-Life Assistant
-"""
+            content = _EVENT_NOTIFICATION_TMPL.format(
+                action=action,
+                title=title,
+                date=event_date,
+                time=event_details.get('time', ''),
+                location=event_details.get('location', ''),
+                organizer=organizer,
+                attendees=', '.join(attendees)
+            )
             return self.send_email(
                 to_emails=to_emails,
                 subject=subject,
@@ -2,13 +2,32 @@
 Location Service for geocoding and location-based searches
 """
 import os
-import requests
+import math
+from src.utils.http_session import create_http_session
 import json
+import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
 from geopy.geocoders import Nominatim
 from geopy.distance import geodesic
 from config.settings import LOCATION_SERVICE, DEFAULT_SEARCH_RADIUS
 
+_DEG2RAD = math.pi / 180
+_EARTH_RADIUS_KM = 6371.0088
+
+
+def _haversine_km_fixed_ref(lat0_rad: float, cos_lat0: float, lat_arr_rad: np.ndarray,
+                            lon_arr_rad: np.ndarray, lon0_rad: float, out: np.ndarray) -> np.ndarray:
+    """
+    Great-circle distances (km) from one reference point to many targets.
+    cos(lat0) is invariant across targets, so callers compute it once.
+    """
+    dlat = lat_arr_rad - lat0_rad
+    dlon = lon_arr_rad - lon0_rad
+    a = np.sin(dlat * 0.5) ** 2 + cos_lat0 * np.cos(lat_arr_rad) * np.sin(dlon * 0.5) ** 2
+    np.arcsin(np.sqrt(a), out=out)
+    out *= 2 * _EARTH_RADIUS_KM
+    return out
+
 class LocationService:
     """
     Location service for geocoding and location-based searches
@@ -18,6 +37,8 @@ class LocationService:
     def __init__(self):
         self.service = LOCATION_SERVICE
         self.search_radius = DEFAULT_SEARCH_RADIUS
+        # Geocoding and Overpass lookups reuse connections instead of a new TLS handshake each
+        self.session = create_http_session()
         
         # Initialize based on service type
         if self.service == "openstreetmap":
@@ -106,7 +127,7 @@ class LocationService:
             if self.api_key:
                 params['key'] = self.api_key
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -208,7 +229,7 @@ class LocationService:
             if self.api_key:
                 params['key'] = self.api_key
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -247,7 +268,7 @@ class LocationService:
             return 0.0
     
     def find_nearby_places(self, lat: float, lon: float, radius: float = None, 
-                          place_type: str = None) -> List[Dict[str, Any]]:
+                          place_type: str = None, top_k: int = 10) -> List[Dict[str, Any]]:
         """
         Find nearby places using OpenStreetMap
         
@@ -256,9 +277,10 @@ class LocationService:
             lon: Longitude
             radius: Search radius in meters
             place_type: Type of place to search for
+            top_k: Maximum number of closest places to return
         
         Returns:
-            List of nearby places
+            List of nearby places, closest first
         """
         if radius is None:
             radius = self.search_radius
@@ -279,26 +301,45 @@ class LocationService:
             if self.api_key:
                 params['key'] = self.api_key
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
-                places = []
+                n = len(data)
                 
-                for place in data:
-                    place_lat = float(place.get('lat', 0))
-                    place_lon = float(place.get('lon', 0))
-                    
+                # Bulk-cast coordinates straight into float arrays
+                lats = np.fromiter((float(p.get('lat', 0)) for p in data), dtype=np.float64, count=n)
+                lons = np.fromiter((float(p.get('lon', 0)) for p in data), dtype=np.float64, count=n)
+                
+                # Distances from the fixed search centre, computed in one pass
+                lat0_rad = lat * _DEG2RAD
+                cos_lat0 = math.cos(lat0_rad)
+                distances = _haversine_km_fixed_ref(
+                    lat0_rad, cos_lat0, lats * _DEG2RAD, lons * _DEG2RAD, lon * _DEG2RAD,
+                    np.empty(n, dtype=np.float64)
+                )
+                
+                # Partial sort: only the k closest places are ordered
+                k = min(top_k, n)
+                if k <= 0:
+                    return []
+                if k < n:
+                    nearest = np.argpartition(distances, k - 1)[:k]
+                else:
+                    nearest = np.arange(n)
+                nearest = nearest[np.argsort(distances[nearest], kind='stable')]
+                
+                # Build result dicts only for the places being returned
+                places = []
+                for i in nearest:
+                    place = data[i]
                     places.append({
                         'name': place.get('display_name', ''),
-                        'lat': place_lat,
-                        'lon': place_lon,
+                        'lat': float(lats[i]),
+                        'lon': float(lons[i]),
                         'type': place.get('type', 'unknown'),
-                        'distance': self.calculate_distance(lat, lon, place_lat, place_lon)
+                        'distance': round(float(distances[i]), 2)
                     })
-                
-                # Sort by distance
-                places.sort(key=lambda x: x['distance'])
                 return places
             
             return []
@@ -365,7 +406,8 @@ class LocationService:
         # Get nearby places
         nearby_places = self.find_nearby_places(
             location_data['lat'],
-            location_data['lon']
+            location_data['lon'],
+            top_k=5
         )
         
         return {
@@ -373,7 +415,7 @@ class LocationService:
             'lat': location_data['lat'],
             'lon': location_data['lon'],
             'found': True,
-            'nearby_places': nearby_places[:5],  # Top 5 nearby places
+            'nearby_places': nearby_places,  # Top 5 nearby places
             'service_used': self.service
         }
     
@@ -1,10 +1,31 @@
 """
 Restaurant Service for searching and booking restaurants using Google Places and OpenTripMap APIs only
 """
+import copy
 import os
-import requests
+from src.utils.http_session import create_http_session
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Any, Optional
-from config.settings import RESTAURANT_SERVICE, MAX_RESTAURANT_RESULTS
+from config.settings import (
+    RESTAURANT_SERVICE, MAX_RESTAURANT_RESULTS, RESTAURANT_CACHE_DIR, RESTAURANT_CACHE_TTL
+)
+
+# Optional: persistent search cache that survives restarts (pip install diskcache)
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+# Optional: in-process memo in front of the disk cache (pip install cachetools)
+try:
+    from cachetools import TTLCache
+    CACHETOOLS_AVAILABLE = True
+except ImportError:
+    CACHETOOLS_AVAILABLE = False
+
+# Per-place detail lookups issued at once by a single provider search
+DETAIL_FETCH_WORKERS = 8
 
 class RestaurantService:
     """
@@ -19,6 +40,12 @@ class RestaurantService:
         if not self.google_api_key and not self.opentripmap_api_key and not self.geoapify_api_key:
             raise EnvironmentError("At least one of GOOGLE_PLACES_API_KEY, OPENTRIPMAP_API_KEY, or GEOAPIFY_API_KEY must be set in your .env file for restaurant search. Please add your API keys and restart the app.")
         self._init_apis()
+        # One keep-alive session for every provider call, including the parallel detail fetches
+        self.session = create_http_session()
+        self._cache = diskcache.Cache(RESTAURANT_CACHE_DIR, size_limit=1 << 30) if DISKCACHE_AVAILABLE else None
+        # Memory tier skips the disk read and unpickling for repeats within a session
+        self._memo = TTLCache(maxsize=4096, ttl=RESTAURANT_CACHE_TTL) if CACHETOOLS_AVAILABLE else None
+        self.cache_stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
     
     def _init_apis(self):
         self.available_apis = []
@@ -37,35 +64,62 @@ class RestaurantService:
         print(f"[DEBUG] Searching restaurants in {location} with cuisine: {cuisine}")
         print(f"[DEBUG] Available APIs: {self.available_apis}")
         
-        all_restaurants = []
+        cache_key = self._search_cache_key(location, cuisine, min_rating, max_price, radius)
+        if self._memo is not None:
+            cached = self._memo.get(cache_key)
+            if cached is not None:
+                self.cache_stats['memory_hits'] += 1
+                print(f"[DEBUG] Restaurant memory cache hit: {len(cached)} restaurants")
+                # Callers sort and annotate the restaurant dicts in place, so hand out a deep copy
+                return copy.deepcopy(cached)
+        if self._cache is not None:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self.cache_stats['disk_hits'] += 1
+                print(f"[DEBUG] Restaurant cache hit: {len(cached)} restaurants")
+                if self._memo is not None:
+                    self._memo[cache_key] = copy.deepcopy(cached)
+                return cached
+        self.cache_stats['misses'] += 1
+        
+        results_by_api = {}
         successful_apis = []
         
-        for api in self.available_apis:
-            try:
-                print(f"[DEBUG] Trying {api} API...")
-                restaurants = []
-                
-                if api == "google":
-                    restaurants = self._search_google_places(location, cuisine, radius)
-                elif api == "geoapify":
-                    restaurants = self._search_geoapify(location, cuisine, radius)
-                elif api == "opentripmap":
-                    restaurants = self._search_opentripmap(location, cuisine, radius)
-                elif api == "fallback":
-                    restaurants = self._search_fallback(location, cuisine)
-                else:
+        # Query all providers concurrently; stop waiting on the slower ones once
+        # enough well-rated results are already in hand.
+        executor = ThreadPoolExecutor(max_workers=max(1, len(self.available_apis)))
+        try:
+            futures = {
+                executor.submit(self._search_provider, api, location, cuisine, radius): api
+                for api in self.available_apis
+            }
+            for future in as_completed(futures):
+                api = futures[future]
+                try:
+                    restaurants = future.result()
+                except Exception as e:
+                    print(f"[DEBUG] Error with {api} API: {e}")
                     continue
                 
                 if restaurants:
                     print(f"[DEBUG] {api} API returned {len(restaurants)} restaurants")
-                    all_restaurants.extend(restaurants)
+                    results_by_api[api] = restaurants
                     successful_apis.append(api)
                 else:
                     print(f"[DEBUG] {api} API returned no results")
-                    
-            except Exception as e:
-                print(f"[DEBUG] Error with {api} API: {e}")
-                continue
+                    continue
+                
+                collected = [r for rs in results_by_api.values() for r in rs]
+                if len(self._apply_filters(self._remove_duplicates(collected), min_rating, max_price)) >= MAX_RESTAURANT_RESULTS:
+                    print(f"[DEBUG] Enough results from {successful_apis}, skipping remaining APIs")
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        # Merge in provider priority order so de-duplication stays deterministic
+        all_restaurants = []
+        for api in self.available_apis:
+            all_restaurants.extend(results_by_api.get(api, []))
         
         print(f"[DEBUG] Total restaurants before processing: {len(all_restaurants)}")
         print(f"[DEBUG] Successful APIs: {successful_apis}")
@@ -85,8 +139,57 @@ class RestaurantService:
         result = filtered_restaurants[:MAX_RESTAURANT_RESULTS]
         print(f"[DEBUG] Final result: {len(result)} restaurants")
         
+        # Only cache real API results, never the synthetic fallback data
+        if successful_apis:
+            if self._cache is not None:
+                self._cache.set(cache_key, result, expire=RESTAURANT_CACHE_TTL)
+            if self._memo is not None:
+                self._memo[cache_key] = copy.deepcopy(result)
+        
         return result
     
+    @staticmethod
+    def _search_cache_key(location: str, cuisine: str, min_rating: float, max_price: str, radius: int) -> tuple:
+        # Normalize so trivially different spellings of the same query share an entry
+        return (
+            location.strip().lower(),
+            cuisine.strip().lower() if cuisine else None,
+            float(min_rating or 0.0),
+            max_price,
+            int(radius)
+        )
+    
+    def _fetch_details(self, fetch, ids: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Run per-place detail lookups concurrently, preserving input order
+        
+        Args:
+            fetch: Detail lookup taking one place id (must not raise)
+            ids: Place ids; falsy ids map to an empty dict without a request
+        
+        Returns:
+            List of detail dicts aligned with ids
+        """
+        wanted = [i for i in ids if i]
+        if len(wanted) <= 1:
+            return [fetch(i) if i else {} for i in ids]
+        with ThreadPoolExecutor(max_workers=min(DETAIL_FETCH_WORKERS, len(wanted))) as executor:
+            fetched = dict(zip(wanted, executor.map(fetch, wanted)))
+        return [fetched[i] if i else {} for i in ids]
+    
+    def _search_provider(self, api: str, location: str, cuisine: str = None,
+                         radius: int = 5000) -> List[Dict[str, Any]]:
+        print(f"[DEBUG] Trying {api} API...")
+        if api == "google":
+            return self._search_google_places(location, cuisine, radius)
+        elif api == "geoapify":
+            return self._search_geoapify(location, cuisine, radius)
+        elif api == "opentripmap":
+            return self._search_opentripmap(location, cuisine, radius)
+        elif api == "fallback":
+            return self._search_fallback(location, cuisine)
+        return []
+    
     def _search_google_places(self, location: str, cuisine: str = None, radius: int = 5000) -> List[Dict[str, Any]]:
         try:
             coords = self._get_location_coordinates(location)
@@ -107,7 +210,7 @@ class RestaurantService:
             print(f"[DEBUG] Google Places Request URL: {url}")
             print(f"[DEBUG] Google Places Request Params: {params}")
             
-            response = requests.get(url, params=params, timeout=15)
+            response = self.session.get(url, params=params, timeout=15)
             print(f"[DEBUG] Google Places Status Code: {response.status_code}")
             
             if response.status_code != 200:
@@ -122,8 +225,12 @@ class RestaurantService:
             
             print(f"[DEBUG] Google Places found {len(data.get('results', []))} places")
             
+            places = data.get("results", [])
+            # One details round trip per place; issue them together instead of back to back
+            place_details = self._fetch_details(self._get_google_place_details, [place.get("place_id") for place in places])
+            
             restaurants = []
-            for place in data.get("results", []):
+            for place, details in zip(places, place_details):
                 restaurant = {
                     "id": place.get("place_id"),
                     "name": place.get("name"),
@@ -146,9 +253,8 @@ class RestaurantService:
                     cuisine_types = [t for t in restaurant["types"] if "restaurant" in t or "food" in t]
                     restaurant["cuisine"] = cuisine_types[0].replace("_", " ").title() if cuisine_types else "Various"
                 
-                # Get additional details if place_id is available
+                # Add details if place_id was available
                 if place.get("place_id"):
-                    details = self._get_google_place_details(place.get("place_id"))
                     restaurant.update(details)
                     
                 restaurants.append(restaurant)
@@ -168,7 +274,7 @@ class RestaurantService:
                 "fields": "formatted_phone_number,opening_hours,website,reviews",
                 "key": self.google_api_key
             }
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             data = response.json()
             result = data.get("result", {})
             return {
@@ -204,7 +310,7 @@ class RestaurantService:
             print(f"[DEBUG] OpenTripMap Request URL: {url}")
             print(f"[DEBUG] OpenTripMap Request Params: {params}")
             
-            response = requests.get(url, params=params, timeout=15)
+            response = self.session.get(url, params=params, timeout=15)
             print(f"[DEBUG] OpenTripMap Status Code: {response.status_code}")
             
             if response.status_code != 200:
@@ -214,10 +320,11 @@ class RestaurantService:
             data = response.json()
             print(f"[DEBUG] OpenTripMap found {len(data)} places")
             
+            # Get detailed information for every place concurrently
+            all_details = self._fetch_details(self._get_opentripmap_details, [place.get("xid") for place in data])
+            
             restaurants = []
-            for place in data:
-                # Get detailed information for each place
-                place_details = self._get_opentripmap_details(place.get("xid"))
+            for place, place_details in zip(data, all_details):
                 if place_details and place_details.get("name"):
                     restaurant = {
                         "id": place.get("xid"),
@@ -255,7 +362,7 @@ class RestaurantService:
         try:
             url = f"https://api.opentripmap.com/0.1/en/places/xid/{xid}"
             params = {"apikey": self.opentripmap_api_key}
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             if response.status_code == 200:
                 return response.json()
         except Exception as e:
@@ -402,7 +509,7 @@ class RestaurantService:
                 "text": location,
                 "apiKey": self.geoapify_api_key
             }
-            geocode_resp = requests.get(geocode_url, params=geocode_params, timeout=10)
+            geocode_resp = self.session.get(geocode_url, params=geocode_params, timeout=10)
             geocode_data = geocode_resp.json()
             features = geocode_data.get("features", [])
             if not features:
@@ -423,7 +530,7 @@ class RestaurantService:
                 "limit": 30,
                 "apiKey": self.geoapify_api_key
             }
-            places_resp = requests.get(places_url, params=places_params, timeout=10)
+            places_resp = self.session.get(places_url, params=places_params, timeout=10)
             places_data = places_resp.json()
             restaurants = []
             for place in places_data.get("features", []):
@@ -463,7 +570,7 @@ class RestaurantService:
                     "text": location,
                     "apiKey": self.geoapify_api_key
                 }
-                response = requests.get(url, params=params, timeout=10)
+                response = self.session.get(url, params=params, timeout=10)
                 data = response.json()
                 features = data.get("features", [])
                 if features:
@@ -477,7 +584,7 @@ class RestaurantService:
                 "address": location,
                 "key": self.google_api_key
             }
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             data = response.json()
             if data.get("status") == "OK" and data.get("results"):
                 lat = float(data["results"][0]["geometry"]["location"]["lat"])
@@ -506,6 +613,26 @@ class RestaurantService:
             filtered.append(restaurant)
         return filtered
     
+    def book_restaurant(self, restaurant_details: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Reserve a table at a restaurant
+        
+        No provider exposes a reservation API yet, so the booking is simulated.
+        
+        Args:
+            restaurant_details: Restaurant, date, time and attendees for the booking
+        
+        Returns:
+            Booking confirmation dictionary
+        """
+        return {
+            'success': True,
+            'restaurant': restaurant_details.get('name', 'Restaurant'),
+            'date': restaurant_details.get('date'),
+            'time': restaurant_details.get('time'),
+            'party_size': len(restaurant_details.get('attendees', [])) + 1
+        }
+    
     def get_restaurant_recommendations(self, location: str, preferences: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         try:
             restaurants = self.search_restaurants(location)
@@ -6,9 +6,11 @@ from .validators import *
 from .formatters import *
 from .name_matcher import NameMatcher
 from .time_formatter import TimeFormatter
+from .http_session import create_http_session
 
 __all__ = [
     'setup_logger',
     'NameMatcher',
-    'TimeFormatter'
+    'TimeFormatter',
+    'create_http_session'
 ] 
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""
+Shared HTTP session utilities for the Proactive Work-Life Assistant
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from config.settings import HTTP_POOL_SIZE
+
+def create_http_session(pool_size: int = None) -> requests.Session:
+    """
+    Create a requests session that keeps connections alive between calls
+    
+    Args:
+        pool_size: Connections kept per host (defaults to HTTP_POOL_SIZE)
+    
+    Returns:
+        Session with pooled HTTP and HTTPS adapters
+    """
+    if pool_size is None:
+        pool_size = HTTP_POOL_SIZE
+    
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
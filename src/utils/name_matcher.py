@@ -16,6 +16,12 @@ except ImportError:
 
 from config.settings import NAME_VARIATIONS
 
+# Words in a query that can name a team member (keeps '.', '-' and "'" inside tokens)
+_QUERY_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9._'-]*", re.IGNORECASE)
+
+# Words after which a lone capitalized first or last name is taken for an attendee ("with Mark")
+_NAME_CUE_WORDS = frozenset({'with', 'and', 'invite'})
+
 class NameMatcher:
     """
     Utility class for matching employee names to emails with fuzzy matching
@@ -23,6 +29,186 @@ class NameMatcher:
     
     def __init__(self):
         self.team_contacts = self._load_team_contacts()
+        self._rebuild_indexes()
+    
+    def _rebuild_indexes(self):
+        """
+        Build lookup indexes over team contacts so per-query resolution doesn't scan every contact.
+        
+        - _email_index: lowercased email -> contact
+        - _first_name_index: lowercased first name -> contact
+        - _name_index: lowercased full name -> display name (contacts with an email only)
+        - _token_index: name token, initials or email local-part -> set of display names
+        - _word_index: name word (first, last, ...) -> set of display names
+        - team_name_set / team_email_list: whole-team lowercased names and (deduplicated) emails
+        - team_names_lower: (lowercased, display) name pairs in roster order, one per member
+        - roster_version: bumped on every rebuild so callers can tell cached lookups are stale
+        
+        The first contact for a given email or first name wins, matching the old linear-scan order.
+        """
+        self._email_index = {}
+        self._first_name_index = {}
+        self._name_index = {}
+        self._token_index = {}
+        self._word_index = {}
+        self._max_name_words = 1
+        team_names = set()
+        self.team_email_list = []
+        self.team_names_lower = []
+        for contact in self.team_contacts.values():
+            email = contact.get('email')
+            name = contact.get('name', '') or ''
+            full_name = name.lower().strip()
+            if full_name:
+                self._first_name_index.setdefault(full_name.split()[0], contact)
+            if not (email and isinstance(email, str)):
+                continue
+            if email.lower() not in self._email_index:
+                self.team_email_list.append(email)
+            self._email_index.setdefault(email.lower(), contact)
+            if not full_name:
+                continue
+            if full_name not in team_names:
+                self.team_names_lower.append((full_name, name))
+            team_names.add(full_name)
+            
+            words = full_name.split()
+            self._name_index.setdefault(full_name, name)
+            self._max_name_words = max(self._max_name_words, len(words))
+            for word in words:
+                if len(word) > 1:
+                    self._word_index.setdefault(word, set()).add(name)
+            tokens = set(words)
+            if len(words) > 1:
+                tokens.add(''.join(word[0] for word in words))
+            tokens.add(email.lower().split('@')[0])
+            for token in tokens:
+                if len(token) > 1:
+                    self._token_index.setdefault(token, set()).add(name)
+        self.team_name_set = frozenset(team_names)
+        self._fuzzy_keys = list(self.team_contacts.keys())
+        self.roster_version = getattr(self, 'roster_version', 0) + 1
+    
+    def is_whole_team(self, names: List[str]) -> bool:
+        """
+        Check whether a list of names is exactly the whole team (case-insensitive)
+        
+        Args:
+            names: Employee names
+        
+        Returns:
+            True if the names cover every team member and nobody else
+        """
+        return bool(names) and {n.lower().strip() for n in names} == self.team_name_set
+    
+    @staticmethod
+    def _resolve_tokens(tokens: List[str], index: Dict[str, set]) -> set:
+        """
+        Resolve single tokens through an index, keeping unambiguous hits only
+        
+        Args:
+            tokens: Lowercase tokens, in query order
+            index: Token -> set of display names
+        
+        Returns:
+            Set of matched display names
+        """
+        matched = set()
+        for i, token in enumerate(tokens):
+            bucket = index.get(token)
+            if not bucket:
+                continue
+            # An ambiguous bucket is narrowed by the following token
+            if len(bucket) > 1 and i + 1 < len(tokens):
+                narrowed = bucket & index.get(tokens[i + 1], set())
+                if narrowed:
+                    bucket = narrowed
+            if len(bucket) == 1:
+                matched |= bucket
+        return matched
+    
+    @staticmethod
+    def _follows_name_cue(text: str, words: list, i: int) -> bool:
+        """
+        Check whether the i-th query word comes right after a name cue ("with", "and", "invite", "," or "&")
+        
+        A word that opens a sentence never counts, so "Will you..." or "Mark the calendar" stay words.
+        
+        Args:
+            text: Query string as typed
+            words: _QUERY_TOKEN_RE matches over text
+            i: Index of the word to check
+        
+        Returns:
+            True if the word follows a cue within the same sentence
+        """
+        if i == 0:
+            return False
+        previous = words[i - 1]
+        gap = text[previous.end():words[i].start()]
+        if previous.group().endswith('.') or any(c in gap for c in '.!?'):
+            return False
+        return ',' in gap or '&' in gap or previous.group().lower() in _NAME_CUE_WORDS
+    
+    def _match_query_tokens(self, user_query: str) -> set:
+        """
+        Resolve names mentioned anywhere in free text
+        
+        Whole names ("john smith", word-bounded) always count. A lone first or last name only
+        counts when it is capitalized and follows a name cue ("with Mark", "Alice, Bob"), so
+        everyday words that happen to be names ("Will you...", "Mark the calendar") aren't taken
+        for attendees; other lone names, initials and email local-parts are left to _match_segment
+        and the fuzzy fallback.
+        
+        Args:
+            user_query: Query string as typed
+        
+        Returns:
+            Set of matched display names
+        """
+        words = list(_QUERY_TOKEN_RE.finditer(user_query))
+        raw_tokens = [word.group().strip(".'-") for word in words]
+        tokens = [t.lower() for t in raw_tokens]
+        matched = set()
+        
+        for size in range(self._max_name_words, 0, -1):
+            for i in range(len(tokens) - size + 1):
+                name = self._name_index.get(' '.join(tokens[i:i + size]))
+                if name:
+                    matched.add(name)
+        
+        cued = [token if raw[:1].isupper() and self._follows_name_cue(user_query, words, i) else ''
+                for i, (raw, token) in enumerate(zip(raw_tokens, tokens))]
+        matched |= self._resolve_tokens(cued, self._word_index)
+        return matched
+    
+    def _match_segment(self, seg_lower: str) -> set:
+        """
+        Resolve a separator-delimited segment made up only of name tokens ("mark", "j smith", "jsmith")
+        
+        Args:
+            seg_lower: Lowercase segment
+        
+        Returns:
+            Set of matched display names, empty if any word of the segment isn't a name token
+        """
+        tokens = [t.strip(".'-") for t in _QUERY_TOKEN_RE.findall(seg_lower)]
+        if not tokens or any(token not in self._token_index for token in tokens):
+            return set()
+        return self._resolve_tokens(tokens, self._token_index)
+    
+    def get_name_for_email(self, email: str) -> Optional[str]:
+        """
+        Get a team member's name from their email address
+        
+        Args:
+            email: Email address (any case)
+        
+        Returns:
+            Name or None if the email is not a known contact
+        """
+        contact = self._email_index.get(email.lower().strip())
+        return contact.get('name') if contact else None
     
     def _load_team_contacts(self) -> Dict[str, Dict[str, str]]:
         """
@@ -101,7 +287,6 @@ class NameMatcher:
             return [member['name'] for member in self.get_team_members()]
 
         # Split on common separators
-        import re
         separators = [',', ' and ', ' & ']
         segments = [user_query]
         for sep in separators:
@@ -110,23 +295,24 @@ class NameMatcher:
                 new_segments.extend([s.strip() for s in seg.split(sep) if s.strip()])
             segments = new_segments
 
-        matched_names = set()
-        team_names = [member['name'] for member in self.get_team_members()]
-        # First, try to match multi-word names exactly
-        for name in team_names:
-            if name.lower() in query_lower:
-                matched_names.add(name)
-        # Then, try to match each segment to a team member (single-word)
+        # First, resolve whole names (and cued capitalized first/last names) anywhere in the query
+        matched_names = self._match_query_tokens(user_query)
+        # Then, try to match each segment to a team member
         for seg in segments:
             seg_lower = seg.lower()
-            for name in team_names:
-                if seg_lower == name.lower():
-                    matched_names.add(name)
-            # Fuzzy match fallback
-            if hasattr(self, '_fuzzy_match_name'):
-                best_match = self._fuzzy_match_name(seg_lower)
-                if best_match:
-                    matched_names.add(self.team_contacts[best_match]['name'])
+            name = self._name_index.get(seg_lower)
+            if name:
+                matched_names.add(name)
+                continue
+            # Segments that are just name tokens (first/last names, initials, email local-parts)
+            segment_names = self._match_segment(seg_lower)
+            if segment_names:
+                matched_names |= segment_names
+                continue
+            # Fuzzy match fallback, only for segments the indexes couldn't resolve
+            best_match = self._fuzzy_match_name(seg_lower)
+            if best_match:
+                matched_names.add(self.team_contacts[best_match]['name'])
         if matched_names:
             return list(matched_names)
         return ["__ASK_USER_FOR_EMPLOYEE__"]
@@ -216,17 +402,30 @@ class NameMatcher:
         Returns:
             List of email addresses
         """
-        emails = []
+        emails = [email for email in self.resolve_emails(names) if email]
         admin_email = None
-        for name in names:
-            email = self.get_email_for_name(name)
-            if email:
-                emails.append(email)
         # Always include admin
         if admin_email not in emails:
             emails.append(admin_email)
         return emails
     
+    def resolve_emails(self, names: List[str]) -> List[Optional[str]]:
+        """
+        Resolve a batch of names in one pass, one entry per input name
+        
+        Args:
+            names: List of employee names or emails
+        
+        Returns:
+            List of email addresses parallel to names (None where unmatched)
+        """
+        # Repeated names hit the matcher (and its fuzzy fallback) only once
+        resolved = {}
+        for name in names:
+            if name not in resolved:
+                resolved[name] = self.get_email_for_name(name)
+        return [resolved[name] for name in names]
+    
     def get_email_for_name(self, name: str) -> Optional[str]:
         """
         Get email address for a specific name or email using fuzzy matching
@@ -243,19 +442,16 @@ class NameMatcher:
             return self.team_contacts[name_lower]['email']
 
         # Direct match by email
-        for contact in self.team_contacts.values():
-            if contact.get('email', '').lower() == name_lower:
-                print(f"[NameMatcher] Direct email match for '{name_lower}' -> {contact['email']}")
-                return contact['email']
+        contact = self._email_index.get(name_lower)
+        if contact:
+            print(f"[NameMatcher] Direct email match for '{name_lower}' -> {contact['email']}")
+            return contact['email']
 
         # First name match (robust)
-        for contact in self.team_contacts.values():
-            full_name = contact.get('name', '').lower().strip()
-            if full_name:
-                first_name = full_name.split()[0]
-                if name_lower == first_name:
-                    print(f"[NameMatcher] First name match for '{name_lower}' -> {contact.get('email')}")
-                    return contact.get('email')
+        contact = self._first_name_index.get(name_lower)
+        if contact:
+            print(f"[NameMatcher] First name match for '{name_lower}' -> {contact.get('email')}")
+            return contact.get('email')
 
         # Fuzzy match (lower threshold for short names)
         threshold = 80 if len(name_lower) > 2 else 60
@@ -280,12 +476,10 @@ class NameMatcher:
             # Fallback to SequenceMatcher
             return self._fuzzy_match_name_fallback(name)
         
-        team_names = list(self.team_contacts.keys())
-        
         # Use fuzzywuzzy for better matching
         matches = process.extractBests(
             name, 
-            team_names, 
+            self._fuzzy_keys, 
             scorer=fuzz.token_sort_ratio,
             score_cutoff=threshold
         )
@@ -348,6 +542,7 @@ class NameMatcher:
                 'email': email,
                 'full_name': full_name if full_name is not None else name
             }
+            self._rebuild_indexes()
             
             # Save to file
             self._save_team_contacts()
@@ -369,6 +564,7 @@ class NameMatcher:
             name_lower = name.lower()
             if name_lower in self.team_contacts:
                 del self.team_contacts[name_lower]
+                self._rebuild_indexes()
                 self._save_team_contacts()
                 return True
             return False
@@ -6,6 +6,8 @@ from datetime import datetime, date
 from typing import List, Dict, Any, Optional
 from config.settings import DATE_FORMATS, TIME_FORMATS, TEAM_SIZE_LIMIT
 
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 def validate_email(email: str) -> bool:
     """
     Validate email format
@@ -16,8 +18,7 @@ def validate_email(email: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return bool(_EMAIL_RE.match(email))
 
 def validate_date(date_str: str) -> bool:
     """